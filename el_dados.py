@@ -1,19 +1,62 @@
 
+import numpy as np
 import pandas as pd
 from faker import Faker
 import random
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import argparse
+import multiprocessing
 import sys
 import os
+import re
+import json
+import time
+import gzip
+import hashlib
+import shutil
+import tempfile
+import contextlib
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for zstd-compressed CSV
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: only needed for the Arrow/Polars backends, Parquet/IPC files and fast CSV reads
+    pa = pa_csv = pq = None
+
+try:
+    import polars as pl
+except ImportError:  # Optional: only needed for the Polars backend
+    pl = None
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows: the output cache manifest is then updated unlocked
+    fcntl = None
 
 # Configure Faker for Brazilian Portuguese
 fake = Faker('pt_BR')
 
+# NumPy generator for vectorized columns (reseeded together with Faker by set_seed)
+np_rng = np.random.default_rng()
+
+# Fixed "now" for generated dates; None means the current time (see pinned_reference_time)
+REFERENCE_TIME: Optional[datetime] = None
+
 def generate_cpf() -> str:
-    """Generate a unique CPF number"""
-    return fake.cpf()
+    """Generate a CPF number (a single draw of generate_cpfs)"""
+    return str(generate_cpfs(1)[0])
 
 # Maximum number of rows for dimension tables, and number of rows for fact tables
 NUM_ROWS_DIM = 40
@@ -23,47 +66,396 @@ NUM_ROWS_FACT = 10000
 # Utility Functions
 ###############################
 
-def gerar_categoria_e_estabelecimento() -> Tuple[str, str]:
-    """Generate a category and establishment pair"""
-    categorias_estabelecimentos = {
-        'Alimentação': [
-            'Restaurante Gourmet', 'Fast Food', 'Padaria Premium', 
-            'Cafeteria Especializada', 'Mercado Orgânico'
-        ],
-        'Transporte': [
-            'Aplicativo de Mobilidade', 'Posto de Combustível', 
-            'Estacionamento', 'Pedágio', 'Locadora de Veículos'
-        ],
-        'Entretenimento': [
-            'Cinema Premium', 'Teatro Municipal', 'Streaming', 
-            'Casa de Shows', 'Parque Temático'
-        ],
-        'Saúde': [
-            'Farmácia', 'Academia Premium', 'Clínica Especializada', 
-            'Laboratório', 'Plano de Saúde'
-        ],
-        'Educação': [
-            'Livraria', 'Curso Online', 'Material Escolar', 
-            'Mensalidade', 'Plataforma Educacional'
-        ],
-        'Vestuário': [
-            'Loja de Departamento', 'Boutique de Luxo', 
-            'Fast Fashion', 'Outlet Premium', 'E-commerce'
-        ],
-        'Serviços': [
-            'Assinatura Digital', 'Serviço de Streaming', 
-            'Aplicativo Premium', 'Seguro', 'Manutenção'
-        ],
-        'Viagem': [
-            'Companhia Aérea', 'Hotel de Luxo', 'Agência de Viagens', 
-            'Cruzeiro', 'Aluguel por Temporada'
-        ]
-    }
+class HierarchicalSampler:
+    """
+    Vectorized sampler of (parent, child) pairs from a {parent: [children]} mapping
+    
+    The mapping is flattened once into code tables: the parent labels, all
+    children laid out parent by parent, and each parent's child offset and
+    count. A sample draws parent codes, then child codes as the parent's
+    offset plus a uniform position within its group, so every child is
+    consistent with its parent and n pairs cost a few array operations.
+    """
+    
+    def __init__(self, mapping: Dict[str, List[Any]]):
+        self.parents = np.array(list(mapping), dtype=object)
+        self.children = np.array([child for children in mapping.values() for child in children], dtype=object)
+        self.counts = np.array([len(children) for children in mapping.values()])
+        self.offsets = np.cumsum(self.counts) - self.counts
+    
+    def sample_codes(self, num_rows: int, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Parent codes (into self.parents) and child codes (into self.children)"""
+        rng = rng or np_rng
+        parents = rng.integers(0, len(self.parents), num_rows)
+        children = self.offsets[parents] + (rng.random(num_rows) * self.counts[parents]).astype(np.int64)
+        return parents, children
+    
+    def sample(self, num_rows: int, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Parent and child labels"""
+        parents, children = self.sample_codes(num_rows, rng)
+        return self.parents[parents], self.children[children]
+
+# Purchase categories and their establishments
+CATEGORIAS_ESTABELECIMENTOS = HierarchicalSampler({
+    'Alimentação': ['Supermercado Pão de Açúcar', 'Restaurante Outback', 'McDonald\'s', 'Padaria São Paulo', 'iFood'],
+    'Transporte': ['Uber', '99 Táxi', 'Posto Ipiranga', 'Estacionamento Shopping', 'Metrô SP'],
+    'Saúde': ['Drogaria São Paulo', 'Farmácia Raia', 'Academia SmartFit', 'Clínica Einstein', 'Ultrafarma'],
+    'Educação': ['Livraria Cultura', 'Curso Alura', 'Udemy', 'Faculdade Anhembi', 'Escola de Idiomas'],
+    'Lazer': ['Cinema Cinemark', 'Netflix', 'Spotify', 'Teatro Municipal', 'Parque Hopi Hari'],
+    'Vestuário': ['Renner', 'C&A', 'Zara', 'Nike Store', 'Adidas'],
+    'Casa': ['Casas Bahia', 'Magazine Luiza', 'Leroy Merlin', 'Tok&Stok', 'Cobasi'],
+    'Tecnologia': ['Amazon', 'Apple Store', 'Samsung Store', 'Fast Shop', 'Kabum'],
+    'Serviços': ['Salão de Beleza', 'Lavanderia 5àSec', 'Conserto Celular', 'Advocacia', 'Seguro Auto'],
+    'Viagem': ['Decolar.com', 'Booking.com', 'Hotel Ibis', 'Gol Linhas Aéreas', 'Airbnb']
+})
+
+# Cities of each state with the range of their 5-digit CEP prefixes
+CIDADES_POR_ESTADO = {
+    'AC': [('Rio Branco', 69900, 69924), ('Cruzeiro do Sul', 69980, 69981)],
+    'AL': [('Maceió', 57000, 57099), ('Arapiraca', 57300, 57319)],
+    'AM': [('Manaus', 69000, 69099), ('Parintins', 69150, 69154)],
+    'AP': [('Macapá', 68900, 68914), ('Santana', 68925, 68929)],
+    'BA': [('Salvador', 40000, 42599), ('Feira de Santana', 44000, 44149), ('Vitória da Conquista', 45000, 45099)],
+    'CE': [('Fortaleza', 60000, 61599), ('Caucaia', 61600, 61699), ('Juazeiro do Norte', 63000, 63059)],
+    'DF': [('Brasília', 70000, 72799)],
+    'ES': [('Vitória', 29000, 29099), ('Vila Velha', 29100, 29129), ('Serra', 29160, 29184)],
+    'GO': [('Goiânia', 74000, 74899), ('Aparecida de Goiânia', 74900, 74999), ('Anápolis', 75000, 75159)],
+    'MA': [('São Luís', 65000, 65109), ('Imperatriz', 65900, 65919)],
+    'MG': [('Belo Horizonte', 30000, 31999), ('Contagem', 32000, 32399), ('Juiz de Fora', 36000, 36099),
+           ('Uberlândia', 38400, 38414)],
+    'MS': [('Campo Grande', 79000, 79129), ('Dourados', 79800, 79849)],
+    'MT': [('Cuiabá', 78000, 78109), ('Várzea Grande', 78110, 78159), ('Rondonópolis', 78700, 78749)],
+    'PA': [('Belém', 66000, 66999), ('Ananindeua', 67000, 67199), ('Santarém', 68000, 68109)],
+    'PB': [('João Pessoa', 58000, 58099), ('Campina Grande', 58400, 58444)],
+    'PE': [('Recife', 50000, 52999), ('Olinda', 53000, 53399), ('Jaboatão dos Guararapes', 54000, 54499),
+           ('Caruaru', 55000, 55099)],
+    'PI': [('Teresina', 64000, 64099), ('Parnaíba', 64200, 64219)],
+    'PR': [('Curitiba', 80000, 82999), ('Londrina', 86000, 86099), ('Maringá', 87000, 87119)],
+    'RJ': [('Rio de Janeiro', 20000, 23799), ('Niterói', 24000, 24399), ('Duque de Caxias', 25000, 25299),
+           ('Petrópolis', 25600, 25779), ('Nova Iguaçu', 26000, 26099)],
+    'RN': [('Natal', 59000, 59161), ('Mossoró', 59600, 59649)],
+    'RO': [('Porto Velho', 76800, 76834), ('Ji-Paraná', 76900, 76939)],
+    'RR': [('Boa Vista', 69300, 69339)],
+    'RS': [('Porto Alegre', 90000, 91999), ('Caxias do Sul', 95000, 95124), ('Pelotas', 96000, 96099)],
+    'SC': [('Florianópolis', 88000, 88099), ('Blumenau', 89000, 89099), ('Joinville', 89200, 89239)],
+    'SE': [('Aracaju', 49000, 49099), ('Nossa Senhora do Socorro', 49160, 49164)],
+    'SP': [('São Paulo', 1000, 5999), ('Guarulhos', 7000, 7399), ('Santos', 11000, 11099),
+           ('São José dos Campos', 12200, 12248), ('Campinas', 13000, 13139), ('Ribeirão Preto', 14000, 14114),
+           ('Sorocaba', 18000, 18109)],
+    'TO': [('Palmas', 77000, 77270), ('Araguaína', 77800, 77829)]
+}
+
+ESTADOS_CIDADES = HierarchicalSampler({
+    estado: [cidade for cidade, _, _ in cidades] for estado, cidades in CIDADES_POR_ESTADO.items()
+})
+
+# CEP prefix range of each city, aligned with ESTADOS_CIDADES.children
+_CEP_RANGES = np.array([(low, high) for cidades in CIDADES_POR_ESTADO.values() for _, low, high in cidades])
+
+def random_addresses(num_rows: int, rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Consistent (state, city, CEP) columns: each city lies in its state and each CEP in its city's range"""
+    rng = rng or np_rng
+    if num_rows == 0:
+        empty = np.empty(0, dtype=object)
+        return empty, empty.copy(), empty.copy()
+    estados, cidades = ESTADOS_CIDADES.sample_codes(num_rows, rng)
+    low, high = _CEP_RANGES[cidades].T
+    prefixes = low + (rng.random(num_rows) * (high - low + 1)).astype(np.int64)
+    suffixes = rng.integers(0, 1000, num_rows)
+    ceps = np.char.add(np.char.add(np.char.zfill(prefixes.astype(str), 5), '-'), np.char.zfill(suffixes.astype(str), 3))
+    return ESTADOS_CIDADES.parents[estados], ESTADOS_CIDADES.children[cidades], ceps.astype(object)
+
+# Placeholder for columns computed by apply_derived_columns
+DERIVED = object()
+
+class _ArrayColumns(dict):
+    """Column mapping that converts list columns to NumPy arrays on first access"""
+    
+    def __init__(self, data: Dict[str, Any], context: Dict[str, Any]):
+        super().__init__((name, np.asarray(values)) for name, values in context.items())
+        self.data = data
+    
+    def __missing__(self, name: str) -> np.ndarray:
+        values = self.data[name]
+        if values is DERIVED:
+            raise KeyError(f"Derived column '{name}' used before it was computed")
+        self[name] = array = np.asarray(values)
+        return array
+
+def apply_derived_columns(data: Dict[str, Any], derived: Dict[str, Any], **context: Any) -> Dict[str, Any]:
+    """
+    Evaluate derived columns as array expressions over the other columns
+    
+    Each expression receives a mapping of column name to NumPy array and
+    returns the whole column at once. Expressions run in order, so later
+    ones may use earlier results. Columns marked DERIVED in data keep their
+    position; extra context arrays (e.g. dimension attributes aligned to
+    the fact rows) are visible to expressions but not added to the output.
+    """
+    columns = _ArrayColumns(data, context)
+    for name, expression in derived.items():
+        data[name] = columns[name] = expression(columns)
+    
+    missing = [name for name, values in data.items() if values is DERIVED]
+    if missing:
+        raise ValueError(f"No expression given for derived columns: {', '.join(missing)}")
+    return data
+
+def with_nulls(values: Any, null_rate: float) -> Any:
+    """
+    Blank out about null_rate of a column using one bulk mask
+    
+    Integers, floats and booleans come back as pandas nullable arrays
+    (keeping their width, e.g. int8 -> Int8), datetimes with NaT, and
+    anything else as an object array with None.
+    """
+    values = np.asarray(values)
+    mask = np_rng.random(len(values)) < null_rate
+    
+    if values.dtype.kind in 'iu':
+        return pd.arrays.IntegerArray(values, mask)
+    if values.dtype.kind == 'f':
+        return pd.arrays.FloatingArray(values, mask)
+    if values.dtype.kind == 'b':
+        return pd.arrays.BooleanArray(values, mask)
+    if values.dtype.kind == 'M':
+        values = values.copy()
+        values[mask] = np.datetime64('NaT')
+        return values
+    
+    values = values.astype(object)
+    values[mask] = None
+    return values
+
+def reference_time() -> datetime:
+    """The 'now' that generated dates are relative to (REFERENCE_TIME when pinned)"""
+    return REFERENCE_TIME or datetime.now()
+
+@contextlib.contextmanager
+def pinned_reference_time(value: Optional[datetime] = None):
+    """Pin the reference time (default: today at midnight) for the duration of a block"""
+    global REFERENCE_TIME
+    previous = REFERENCE_TIME
+    REFERENCE_TIME = value or previous or datetime.combine(datetime.now().date(), datetime.min.time())
+    try:
+        yield REFERENCE_TIME
+    finally:
+        REFERENCE_TIME = previous
+
+def random_dates(num_rows: int, start_days: int, end_days: int) -> np.ndarray:
+    """Random dates between today + start_days and today + end_days (inclusive)"""
+    today = np.datetime64(reference_time().date(), 'D')
+    return (today + np_rng.integers(start_days, end_days + 1, num_rows)).astype('datetime64[s]')
+
+def random_datetimes(num_rows: int, start_days: int, end_days: int = 0) -> np.ndarray:
+    """Random timestamps between now + start_days and now + end_days"""
+    start = np.datetime64(reference_time(), 'us') + np.timedelta64(start_days, 'D')
+    span = (end_days - start_days) * 86400 * 10 ** 6
+    return start + np_rng.integers(0, span, num_rows, endpoint=True).astype('timedelta64[us]')
+
+# Weights of the CPF check digits over the first 9 and first 10 digits
+_CPF_WEIGHTS_1 = np.arange(10, 1, -1)
+_CPF_WEIGHTS_2 = np.arange(11, 1, -1)
+
+def cpf_check_digits(digits: np.ndarray) -> np.ndarray:
+    """Both CPF check digits for an (n, 9) array of base digits"""
+    first = (digits @ _CPF_WEIGHTS_1 * 10) % 11 % 10
+    second = (np.column_stack([digits, first]) @ _CPF_WEIGHTS_2 * 10) % 11 % 10
+    return np.column_stack([first, second])
+
+def generate_cpfs(num_rows: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Generate formatted, valid CPF numbers in bulk (XXX.XXX.XXX-XX)"""
+    digits = (rng or np_rng).integers(0, 10, (num_rows, 9))
+    digits = np.column_stack([digits, cpf_check_digits(digits)]).astype(np.uint8) + ord('0')
+    
+    # Lay the digits and separators out as 14 bytes per row, then view them as strings
+    chars = np.empty((num_rows, 14), dtype=np.uint8)
+    chars[:, [0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13]] = digits
+    chars[:, [3, 7]] = ord('.')
+    chars[:, 11] = ord('-')
+    return chars.view('S14').ravel().astype(str).astype(object)
+
+def generate_unique(factory: Callable[[int], Any], num_rows: int, max_rounds: int = 20,
+                    fallback: Optional[Callable[[int], Any]] = None, min_acceptance: float = 0.5) -> np.ndarray:
+    """
+    Generate num_rows distinct values from a bulk candidate factory
+    
+    Candidates are produced in bulk and deduplicated on 64-bit hashes, both
+    within the batch and against the values already accepted; only the
+    collided slots are refilled in the next round (with some extra
+    candidates, so the last few slots fill quickly). Only the sorted hashes
+    are kept for membership, so the extra memory is 8 bytes per row. The
+    fallback factory (typically one with a larger value space), if given,
+    takes over for good as soon as a round fills less than min_acceptance
+    of the missing slots (with the extra candidates, a value space that is
+    far from used up fills nearly all of them), and at the latest after half
+    of max_rounds.
+    """
+    values = np.empty(num_rows, dtype=object)
+    accepted = np.empty(0, dtype=np.uint64)
+    missing = np.arange(num_rows)
+    use_fallback = False
+    
+    for round_number in range(max_rounds):
+        if not len(missing):
+            return values
+        
+        use_fallback = use_fallback or (fallback is not None and round_number >= max_rounds // 2)
+        make = fallback if use_fallback else factory
+        candidates = np.asarray(make(len(missing) + len(missing) // 4 + 16), dtype=object)
+        hashes = pd.util.hash_array(candidates, categorize=False)
+        
+        # First occurrence of each hash in the batch, not seen in earlier rounds
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        if len(accepted):
+            positions = np.searchsorted(accepted, hashes[first]).clip(max=len(accepted) - 1)
+            first = first[accepted[positions] != hashes[first]]
+        
+        first = first[:len(missing)]
+        if fallback is not None and len(first) < min_acceptance * len(missing):
+            use_fallback = True
+        values[missing[:len(first)]] = candidates[first]
+        missing = missing[len(first):]
+        accepted = np.sort(np.concatenate([accepted, hashes[first]]))
+    
+    if len(missing):
+        raise ValueError(f"Could not generate {num_rows} unique values after {max_rounds} rounds "
+                         f"({len(missing)} still colliding)")
+    return values
+
+def unique_cpfs(num_rows: int) -> np.ndarray:
+    """Distinct valid CPF numbers"""
+    return generate_unique(generate_cpfs, num_rows)
+
+def unique_names(num_rows: int) -> np.ndarray:
+    """Distinct person names, adding surnames once plain names run out"""
+    return generate_unique(
+        lambda n: [fake.name() for _ in range(n)], num_rows,
+        fallback=lambda n: [f"{fake.first_name()} {fake.last_name()} {fake.last_name()} {fake.last_name()}"
+                            for _ in range(n)]
+    )
+
+def unique_emails(num_rows: int) -> np.ndarray:
+    """Distinct e-mail addresses, adding a numeric suffix once plain ones run out"""
+    return generate_unique(
+        lambda n: [fake.email() for _ in range(n)], num_rows,
+        fallback=lambda n: [f"{fake.user_name()}{suffix}@{fake.free_email_domain()}"
+                            for suffix in np_rng.integers(10, 10 ** 7, n)]
+    )
+
+def unique_phones(num_rows: int) -> np.ndarray:
+    """Distinct phone numbers"""
+    return generate_unique(lambda n: [fake.phone_number() for _ in range(n)], num_rows)
+
+###############################
+# Table Backends
+###############################
+
+# Generated tables are pandas DataFrames, pyarrow Tables or polars DataFrames
+Table = Any
+BACKENDS = ['pandas', 'arrow', 'polars']
+
+def check_backend(backend: str) -> None:
+    """Raise if a backend is unknown or its optional package is missing"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend '{backend}' not supported. Available options: {', '.join(BACKENDS)}")
+    if backend in ('arrow', 'polars') and pa is None:
+        raise ImportError(f"The {backend} backend requires the 'pyarrow' package (pip install pyarrow)")
+    if backend == 'polars' and pl is None:
+        raise ImportError("The polars backend requires the 'polars' package (pip install polars)")
+
+def check_output_packages(backend: str = 'pandas', file_format: str = 'csv', compression: Optional[str] = None) -> None:
+    """
+    Raise ImportError up front if the backend, file format or compression
+    needs an optional package that is not installed
+    
+    The optional packages are listed in requirements-optional.txt.
+    """
+    check_backend(backend)
+    if file_format in ('parquet', 'ipc') and pa is None:
+        raise ImportError(f"{file_format} output requires the 'pyarrow' package (pip install pyarrow)")
+    if file_format == 'csv' and compression == 'zstd' and zstandard is None:
+        raise ImportError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+
+def make_table(data: Dict[str, Any], backend: str = 'pandas') -> Table:
+    """
+    Assemble generated columns into a table of the requested backend
+    
+    With 'arrow' each column goes straight into a pyarrow array (NumPy and
+    pandas nullable arrays without a copy where the types allow) and no
+    DataFrame is built; 'polars' wraps that Arrow table without copying.
+    """
+    if backend == 'pandas':
+        return pd.DataFrame(data)
     
-    categoria = random.choice(list(categorias_estabelecimentos.keys()))
-    estabelecimento = random.choice(categorias_estabelecimentos[categoria])
+    check_backend(backend)
+    table = pa.table({name: pa.array(values, from_pandas=True) for name, values in data.items()})
+    return table if backend == 'arrow' else pl.from_arrow(table)
+
+def column_values(table: Table, name: str) -> List[Any]:
+    """One column of any backend's table as a Python list (columns from dimension_arrays as they are)"""
+    column = table[name]
+    if isinstance(table, dict):
+        return column
+    if pa is not None and isinstance(column, pa.ChunkedArray):
+        return column.to_pylist()
+    return column.to_list()
+
+def slice_table(table: Table, start: int, stop: int) -> Table:
+    """Rows [start, stop) of any backend's table"""
+    if isinstance(table, pd.DataFrame):
+        return table.iloc[start:stop]
+    return table.slice(start, max(stop - start, 0))
+
+def concat_tables(tables: List[Table]) -> Table:
+    """Concatenate tables of the same backend (Arrow and Polars without copying the chunks)"""
+    if isinstance(tables[0], pd.DataFrame):
+        return pd.concat(tables, ignore_index=True)
+    if pa is not None and isinstance(tables[0], pa.Table):
+        return pa.concat_tables(tables)
+    return pl.concat(tables, rechunk=False)
+
+def to_arrow(table: Table) -> Any:
+    """Any backend's table as a pyarrow Table (zero-copy from Polars)"""
+    check_backend('arrow')
+    if isinstance(table, pd.DataFrame):
+        return pa.Table.from_pandas(table, preserve_index=False)
+    if isinstance(table, pa.Table):
+        return table
+    return table.to_arrow()
+
+def _nullable_dtype(arrow_type: Any) -> Any:
+    """pandas nullable dtype for Arrow integer and boolean columns, so nulls don't turn them into floats"""
+    if pa.types.is_boolean(arrow_type):
+        return pd.BooleanDtype()
+    if pa.types.is_integer(arrow_type):
+        # 'int8' -> 'Int8', 'uint16' -> 'UInt16'
+        return pd.api.types.pandas_dtype(str(arrow_type).replace('u', 'U', 1).replace('i', 'I', 1))
+    return None
+
+def to_pandas(table: Table) -> pd.DataFrame:
+    """Any backend's table as a pandas DataFrame"""
+    if isinstance(table, pd.DataFrame):
+        return table
+    return to_arrow(table).to_pandas(types_mapper=_nullable_dtype)
+
+def process_context(backend: str) -> Any:
+    """
+    Multiprocessing context for worker pools building tables of a backend
     
-    return categoria, estabelecimento
+    Polars' thread pool does not survive fork, so its workers are spawned;
+    the other backends keep the platform default.
+    """
+    return multiprocessing.get_context('spawn') if backend == 'polars' else None
+
+def table_backend(table: Table) -> str:
+    """The backend name of a table"""
+    if isinstance(table, pd.DataFrame):
+        return 'pandas'
+    if pa is not None and isinstance(table, pa.Table):
+        return 'arrow'
+    return 'polars'
 
 ###############################
 # Fast Food Data Generator
@@ -72,20 +464,32 @@ def gerar_categoria_e_estabelecimento() -> Tuple[str, str]:
 class FastFoodDataGenerator:
     """Generates sample data for fast food business analytics"""
     
+    FACT_KEY = 'CPF'
+    DIM_COLUMNS = ['CPF']
+    FACT_ID = 'Transacao_ID'
+    # Windows of the fact dates in days from the reference time, and ranges of the
+    # sampled numeric columns (checked by validate_files)
+    FACT_DATES = {'Data_Transacao': (-365, 0)}
+    FACT_RANGES = {
+        'Valor_Total': (10, 300), 'Quantidade_Itens': (1, 10), 'Tempo_Preparo_Min': (5, 45),
+        'Desconto_Aplicado': (0, 30), 'Avaliacao_Cliente': (1, 5), 'Custo_Operacional': (5, 100),
+        'Margem_Lucro': (0.1, 0.6), 'Tempo_Entrega_Min': (10, 90), 'Satisfacao_Entrega': (1, 5)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with employee data"""
+        estados, cidades, ceps = random_addresses(num_rows)
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Data_Nascimento': [fake.date_of_birth(minimum_age=18, maximum_age=65) 
-                              for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Data_Nascimento': random_dates(num_rows, -65 * 365, -18 * 365),
             'Endereço': [fake.street_address() for _ in range(num_rows)],
-            'Cidade': [fake.city() for _ in range(num_rows)],
-            'Estado': [fake.estado_sigla() for _ in range(num_rows)],
-            'CEP': [fake.postcode() for _ in range(num_rows)],
-            'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
+            'Cidade': cidades,
+            'Estado': estados,
+            'CEP': ceps,
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
             'Cargo': [random.choice([
                 'Atendente', 'Cozinheiro', 'Gerente', 
                 'Caixa', 'Auxiliar', 'Supervisor'
@@ -93,8 +497,7 @@ class FastFoodDataGenerator:
             'Turno': [random.choice([
                 'Manhã', 'Tarde', 'Noite', 'Madrugada'
             ]) for _ in range(num_rows)],
-            'Data_Admissao': [fake.date_between(start_date='-5y', end_date='today') 
-                            for _ in range(num_rows)],
+            'Data_Admissao': random_dates(num_rows, -5 * 365, 0),
             'Salario': [round(random.uniform(1320, 5000), 2) for _ in range(num_rows)],
             'Status': [random.choice([
                 'Ativo', 'Férias', 'Afastado', 'Treinamento'
@@ -103,20 +506,18 @@ class FastFoodDataGenerator:
                 'Cozinha', 'Atendimento', 'Caixa', 'Limpeza', 'Delivery'
             ]) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with transaction data"""
-        cpfs = dim_df['CPF'].tolist()
+        cpfs = column_values(dim_df, 'CPF')
         
         # Enhanced transaction data for better insights
         data = {
             'CPF': [random.choice(cpfs) for _ in range(num_rows)],
             'Transacao_ID': [fake.uuid4() for _ in range(num_rows)],
-            'Data_Transacao': [fake.date_time_between(
-                start_date='-1y', end_date='now'
-            ) for _ in range(num_rows)],
+            'Data_Transacao': random_datetimes(num_rows, -365),
             'Valor_Total': [round(random.uniform(10, 300), 2) for _ in range(num_rows)],
             'Quantidade_Itens': [random.randint(1, 10) for _ in range(num_rows)],
             'Item_Principal': [random.choice([
@@ -164,7 +565,7 @@ class FastFoodDataGenerator:
             'Satisfacao_Entrega': [random.randint(1, 5) for _ in range(num_rows)]
         }
         
-        return pd.DataFrame(data)
+        return make_table(data, backend)
 
 ###############################
 # Marketing Data Generator
@@ -173,14 +574,35 @@ class FastFoodDataGenerator:
 class MarketingDataGenerator:
     """Generates sample data for marketing business analytics"""
     
+    FACT_KEY = 'CPF'
+    DIM_COLUMNS = ['CPF']
+    FACT_ID = 'Campanha_ID'
+    FACT_DATES = {'Data_Inicio': (-365, 0), 'Data_Fim': (0, 180)}
+    FACT_RANGES = {
+        'Orcamento': (1000, 50000), 'Gasto_Real': (800, 60000), 'Impressoes': (1000, 1000000),
+        'Cliques': (1, 1000000), 'Conversoes': (1, 1000000), 'CTR': (0, 1)
+    }
+    
+    # Funnel metrics computed from impressions, spend and each other
+    DERIVED_FACTS = {
+        'Cliques': lambda c: np.maximum(np.rint(c['Impressoes'] * np_rng.uniform(0.01, 0.15, len(c['Impressoes']))), 1).astype(np.int64),
+        'Conversoes': lambda c: np.maximum(np.rint(c['Cliques'] * np_rng.uniform(0.005, 0.1, len(c['Cliques']))), 1).astype(np.int64),
+        'CTR': lambda c: np.round(c['Cliques'] / c['Impressoes'], 4),
+        'CPC': lambda c: np.round(c['Gasto_Real'] / c['Cliques'], 2),
+        'CPA': lambda c: np.round(c['Gasto_Real'] / c['Conversoes'], 2),
+        # Revenue is conversions times an average ticket per campaign
+        'ROI': lambda c: np.round(
+            (c['Conversoes'] * np_rng.uniform(20, 500, len(c['Conversoes'])) - c['Gasto_Real']) / c['Gasto_Real'], 2)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with marketing professionals data"""
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
             'Departamento': [random.choice([
                 'Marketing Digital', 'Branding', 'Mídia Social', 
                 'Conteúdo', 'SEO', 'Eventos', 'Relações Públicas'
@@ -189,8 +611,7 @@ class MarketingDataGenerator:
                 'Analista Jr', 'Analista Pleno', 'Analista Sênior', 
                 'Coordenador', 'Gerente', 'Diretor', 'CMO'
             ]) for _ in range(num_rows)],
-            'Data_Admissao': [fake.date_between(start_date='-5y', end_date='today') 
-                            for _ in range(num_rows)],
+            'Data_Admissao': random_dates(num_rows, -5 * 365, 0),
             'Especialidade': [random.choice([
                 'Google Ads', 'Facebook Ads', 'Email Marketing', 
                 'Inbound Marketing', 'Growth Hacking', 'Copywriting', 'Analytics'
@@ -203,22 +624,20 @@ class MarketingDataGenerator:
                 'Google Ads', 'Nenhuma', 'Múltiplas'
             ]) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with marketing campaign data"""
-        cpfs = dim_df['CPF'].tolist()
+        cpfs = column_values(dim_df, 'CPF')
         
         data = {
             'CPF': [random.choice(cpfs) for _ in range(num_rows)],
             'Campanha_ID': [fake.uuid4() for _ in range(num_rows)],
             'Nome_Campanha': [f"Campanha {fake.word().capitalize()} {random.choice(['Q1', 'Q2', 'Q3', 'Q4'])}" 
                              for _ in range(num_rows)],
-            'Data_Inicio': [fake.date_between(start_date='-1y', end_date='today') 
-                           for _ in range(num_rows)],
-            'Data_Fim': [fake.date_between(start_date='today', end_date='+6m') 
-                        for _ in range(num_rows)],
+            'Data_Inicio': random_dates(num_rows, -365, 0),
+            'Data_Fim': random_dates(num_rows, 0, 180),
             'Canal': [random.choice([
                 'Email', 'Social Media', 'Google Ads', 'Facebook Ads', 
                 'Instagram', 'LinkedIn', 'TikTok', 'YouTube'
@@ -226,12 +645,12 @@ class MarketingDataGenerator:
             'Orcamento': [round(random.uniform(1000, 50000), 2) for _ in range(num_rows)],
             'Gasto_Real': [round(random.uniform(800, 60000), 2) for _ in range(num_rows)],
             'Impressoes': [random.randint(1000, 1000000) for _ in range(num_rows)],
-            'Cliques': [random.randint(100, 50000) for _ in range(num_rows)],
-            'Conversoes': [random.randint(1, 1000) for _ in range(num_rows)],
-            'CTR': [round(random.uniform(0.01, 0.15), 4) for _ in range(num_rows)],
-            'CPC': [round(random.uniform(0.5, 10), 2) for _ in range(num_rows)],
-            'CPA': [round(random.uniform(5, 200), 2) for _ in range(num_rows)],
-            'ROI': [round(random.uniform(-0.5, 10), 2) for _ in range(num_rows)],
+            'Cliques': DERIVED,
+            'Conversoes': DERIVED,
+            'CTR': DERIVED,
+            'CPC': DERIVED,
+            'CPA': DERIVED,
+            'ROI': DERIVED,
             'Publico_Alvo': [random.choice([
                 'Jovens 18-24', 'Adultos 25-34', 'Adultos 35-44', 
                 'Sênior 45-65', 'Empresas B2B', 'Pais e Mães', 'Estudantes'
@@ -245,7 +664,7 @@ class MarketingDataGenerator:
             ]) for _ in range(num_rows)]
         }
         
-        return pd.DataFrame(data)
+        return make_table(apply_derived_columns(data, MarketingDataGenerator.DERIVED_FACTS), backend)
 
 ###############################
 # Banking Data Generator
@@ -254,27 +673,34 @@ class MarketingDataGenerator:
 class BankingDataGenerator:
     """Generates sample data for banking business analytics"""
     
+    FACT_KEY = 'CPF'
+    DIM_COLUMNS = ['CPF', 'Tipo_Cartao', 'Programa_Fidelidade']
+    FACT_ID = 'Transacao_ID'
+    FACT_DATES = {'Data_Transacao': (-365, 0), 'Data_Vencimento': (-355, 30), 'Data_Pagamento': (-360, 45)}
+    FACT_RANGES = {
+        'Valor_Transacao': (10, 5000), 'Numero_Parcelas': (1, 12), 'Taxa_Cambio': (4.5, 5.5)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with banking customers data"""
+        estados, cidades, ceps = random_addresses(num_rows)
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Data_Nascimento': [fake.date_of_birth(minimum_age=18, maximum_age=80) 
-                              for _ in range(num_rows)],
-                      'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Data_Nascimento': random_dates(num_rows, -80 * 365, -18 * 365),
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
             'Endereco': [fake.street_address() for _ in range(num_rows)],
-            'Cidade': [fake.city() for _ in range(num_rows)],
-            'Estado': [fake.estado_sigla() for _ in range(num_rows)],
-            'CEP': [fake.postcode() for _ in range(num_rows)],
+            'Cidade': cidades,
+            'Estado': estados,
+            'CEP': ceps,
             'Renda_Mensal': [round(random.uniform(1500, 30000), 2) for _ in range(num_rows)],
             'Score_Credito': [random.randint(100, 1000) for _ in range(num_rows)],
             'Tipo_Conta': [random.choice([
                 'Corrente', 'Poupança', 'Salário', 'Digital', 'Premium', 'Universitária'
             ]) for _ in range(num_rows)],
-            'Data_Abertura_Conta': [fake.date_between(start_date='-10y', end_date='today') 
-                                  for _ in range(num_rows)],
+            'Data_Abertura_Conta': random_dates(num_rows, -10 * 365, 0),
             'Saldo_Atual': [round(random.uniform(-1000, 50000), 2) for _ in range(num_rows)],
             'Limite_Credito': [round(random.uniform(500, 25000), 2) for _ in range(num_rows)],
             'Tipo_Cartao': [random.choice([
@@ -287,20 +713,26 @@ class BankingDataGenerator:
                 'Varejo', 'Alta Renda', 'Private', 'Corporate', 'Empresarial', 'Universitário'
             ]) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with banking transaction data"""
-        transacoes = []
-        pessoas = dim_df.to_dict('records')
+        data = {}
+        cpfs = column_values(dim_df, 'CPF')
+        tipos_cartao = column_values(dim_df, 'Tipo_Cartao')
+        programas_fidelidade = column_values(dim_df, 'Programa_Fidelidade')
+        
+        datas_transacao = random_datetimes(num_rows, -365).tolist()
+        categorias, estabelecimentos = CATEGORIAS_ESTABELECIMENTOS.sample(num_rows)
+        estados, cidades, _ = random_addresses(num_rows)
         
-        for _ in range(num_rows):
-            pessoa = random.choice(pessoas)
-            cpf = pessoa['CPF']
+        for i in range(num_rows):
+            pessoa = random.randrange(len(cpfs))
+            cpf = cpfs[pessoa]
             
             # Gerar data da transação
-            data_transacao = fake.date_time_between(start_date='-1y', end_date='now')
+            data_transacao = datas_transacao[i]
             
             # Gerar data de vencimento (para transações de crédito)
             data_vencimento = data_transacao + timedelta(days=random.choice([10, 15, 30]))
@@ -310,7 +742,7 @@ class BankingDataGenerator:
             data_pagamento = data_vencimento + timedelta(days=offset)
             
             # Gerar valor da transação baseado no tipo de cartão
-            tipo_cartao = pessoa['Tipo_Cartao']
+            tipo_cartao = tipos_cartao[pessoa]
             if tipo_cartao in ['Black', 'Infinite', 'Corporate']:
                 valor = round(random.uniform(100, 5000), 2)
             elif tipo_cartao in ['Gold', 'Platinum', 'Empresarial']:
@@ -318,19 +750,16 @@ class BankingDataGenerator:
             else:
                 valor = round(random.uniform(10, 500), 2)
             
-            # Gerar categoria e estabelecimento
-            categoria, estabelecimento = gerar_categoria_e_estabelecimento()
-            
-            # Adicionar à lista de transações
-            transacoes.append({
+            # Adicionar às colunas de transações
+            transacao = {
                 'CPF': cpf,
                 'Transacao_ID': fake.uuid4(),
                 'Data_Transacao': data_transacao,
                 'Valor_Transacao': valor,
-                'Categoria_Compra': categoria,
-                'Estabelecimento': estabelecimento,
-                'Cidade_Transacao': fake.city(),
-                'Estado_Transacao': fake.estado_sigla(),
+                'Categoria_Compra': categorias[i],
+                'Estabelecimento': estabelecimentos[i],
+                'Cidade_Transacao': cidades[i],
+                'Estado_Transacao': estados[i],
                 'Pais_Transacao': 'Brasil' if random.random() < 0.9 else fake.country(),
                 'Moeda': 'BRL' if random.random() < 0.9 else random.choice(['USD', 'EUR', 'GBP']),
                 'Metodo_Pagamento': random.choice([
@@ -347,14 +776,18 @@ class BankingDataGenerator:
                     'Estornada', 'Contestada'
                 ]),
                 'Data_Vencimento': data_vencimento,
-                'Data_Pagamento': data_pagamento if random.random() < 0.95 else None,
+                'Data_Pagamento': data_pagamento,
                 'Valor_Juros': round(valor * 0.15 * (offset/30), 2) if offset > 0 else 0,
                 'Valor_IOF': round(valor * 0.0638, 2) if random.random() < 0.1 else 0,
-                'Pontos_Acumulados': int(valor * random.uniform(0.5, 2.0)) if pessoa['Programa_Fidelidade'] != 'Nenhum' else 0,
-                'Taxa_Cambio': round(random.uniform(4.5, 5.5), 2) if random.random() < 0.1 else None
-            })
+                'Pontos_Acumulados': int(valor * random.uniform(0.5, 2.0)) if programas_fidelidade[pessoa] != 'Nenhum' else 0
+            }
+            for name, value in transacao.items():
+                data.setdefault(name, []).append(value)
         
-        return pd.DataFrame(transacoes)
+        if data:
+            data['Data_Pagamento'] = with_nulls(np.array(data['Data_Pagamento'], dtype='datetime64[us]'), 0.05)
+            data['Taxa_Cambio'] = with_nulls(np.round(np_rng.uniform(4.5, 5.5, num_rows), 2), 0.9)
+        return make_table(data, backend)
 
 ###############################
 # Healthcare Data Generator
@@ -363,12 +796,21 @@ class BankingDataGenerator:
 class HealthcareDataGenerator:
     """Generates sample data for healthcare business analytics"""
     
+    FACT_KEY = 'CPF_Medico'
+    DIM_COLUMNS = ['CPF']
+    FACT_ID = 'Atendimento_ID'
+    FACT_DATES = {'Data_Atendimento': (-365, 0)}
+    FACT_RANGES = {
+        'Tempo_Atendimento_Min': (10, 180), 'Medicamentos_Prescritos': (0, 8), 'Exames_Solicitados': (0, 5),
+        'Valor_Procedimento': (50, 10000), 'Dias_Internacao': (0, 30), 'Satisfacao_Paciente': (1, 5)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with healthcare professionals data"""
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
             'CRM': [f"{random.randint(10000, 99999)}-{fake.estado_sigla()}" for _ in range(num_rows)],
             'Especialidade': [random.choice([
                 'Clínica Geral', 'Cardiologia', 'Pediatria', 'Ortopedia',
@@ -381,8 +823,7 @@ class HealthcareDataGenerator:
             ]) for _ in range(num_rows)],
             'Hospital': [f"Hospital {fake.last_name()} {random.choice(['Central', 'Regional', 'Especializado', 'Universitário'])}" 
                        for _ in range(num_rows)],
-            'Data_Contratacao': [fake.date_between(start_date='-15y', end_date='today') 
-                               for _ in range(num_rows)],
+            'Data_Contratacao': random_dates(num_rows, -15 * 365, 0),
             'Carga_Horaria': [random.choice([20, 30, 40, 60]) for _ in range(num_rows)],
             'Salario': [round(random.uniform(5000, 30000), 2) for _ in range(num_rows)],
             'Plantoes_Mensais': [random.randint(0, 10) for _ in range(num_rows)],
@@ -396,19 +837,18 @@ class HealthcareDataGenerator:
                 'Ativo', 'Férias', 'Licença', 'Afastado', 'Treinamento'
             ]) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with healthcare attendance data"""
-        cpfs = dim_df['CPF'].tolist()
+        cpfs = column_values(dim_df, 'CPF')
         
         data = {
             'CPF_Medico': [random.choice(cpfs) for _ in range(num_rows)],
             'Atendimento_ID': [fake.uuid4() for _ in range(num_rows)],
-            'CPF_Paciente': [generate_cpf() for _ in range(num_rows)],
-            'Data_Atendimento': [fake.date_time_between(start_date='-1y', end_date='now') 
-                               for _ in range(num_rows)],
+            'CPF_Paciente': generate_cpfs(num_rows),
+            'Data_Atendimento': random_datetimes(num_rows, -365),
             'Tipo_Atendimento': [random.choice([
                 'Consulta', 'Emergência', 'Cirurgia', 'Exame', 
                 'Retorno', 'Telemedicina', 'Procedimento'
@@ -436,7 +876,7 @@ class HealthcareDataGenerator:
             'Complicacoes': [random.choice([True, False]) for _ in range(num_rows)]
         }
         
-        return pd.DataFrame(data)
+        return make_table(data, backend)
 
 ###############################
 # E-commerce Data Generator
@@ -445,24 +885,32 @@ class HealthcareDataGenerator:
 class EcommerceDataGenerator:
     """Generates sample data for e-commerce business analytics"""
     
+    FACT_KEY = 'CPF'
+    DIM_COLUMNS = ['CPF']
+    FACT_ID = 'Pedido_ID'
+    FACT_DATES = {'Data_Pedido': (-365, 0), 'Data_Entrega': (0, 30)}
+    FACT_RANGES = {
+        'Valor_Total': (20, 2000), 'Quantidade_Itens': (1, 15), 'Valor_Frete': (0, 50),
+        'Cupom_Desconto': (0, 100), 'Parcelas': (1, 12), 'Tempo_Entrega_Dias': (1, 30),
+        'Avaliacao_Produto': (1, 5)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with e-commerce customers data"""
+        estados, cidades, ceps = random_addresses(num_rows)
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
-            'Data_Nascimento': [fake.date_of_birth(minimum_age=18, maximum_age=80) 
-                              for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
+            'Data_Nascimento': random_dates(num_rows, -80 * 365, -18 * 365),
             'Endereco_Entrega': [fake.street_address() for _ in range(num_rows)],
-            'Cidade': [fake.city() for _ in range(num_rows)],
-            'Estado': [fake.estado_sigla() for _ in range(num_rows)],
-            'CEP': [fake.postcode() for _ in range(num_rows)],
-            'Data_Cadastro': [fake.date_between(start_date='-5y', end_date='today') 
-                            for _ in range(num_rows)],
-            'Ultima_Compra': [fake.date_between(start_date='-1y', end_date='today') 
-                            for _ in range(num_rows)],
+            'Cidade': cidades,
+            'Estado': estados,
+            'CEP': ceps,
+            'Data_Cadastro': random_dates(num_rows, -5 * 365, 0),
+            'Ultima_Compra': random_dates(num_rows, -1 * 365, 0),
             'Total_Compras': [random.randint(1, 50) for _ in range(num_rows)],
             'Valor_Total_Gasto': [round(random.uniform(100, 10000), 2) for _ in range(num_rows)],
             'Categoria_Preferida': [random.choice([
@@ -478,18 +926,17 @@ class EcommerceDataGenerator:
             'Newsletter': [random.choice([True, False]) for _ in range(num_rows)],
             'Cupom_Ativo': [random.choice([True, False]) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
             """Generate fact table with e-commerce transaction data"""
-            cpfs = dim_df['CPF'].tolist()
+            cpfs = column_values(dim_df, 'CPF')
             
             data = {
                 'CPF': [random.choice(cpfs) for _ in range(num_rows)],
                 'Pedido_ID': [fake.uuid4() for _ in range(num_rows)],
-                'Data_Pedido': [fake.date_time_between(start_date='-1y', end_date='now') 
-                            for _ in range(num_rows)],
+                'Data_Pedido': random_datetimes(num_rows, -365),
                 'Valor_Total': [round(random.uniform(20, 2000), 2) for _ in range(num_rows)],
                 'Quantidade_Itens': [random.randint(1, 15) for _ in range(num_rows)],
                 'Categoria_Principal': [random.choice([
@@ -511,11 +958,9 @@ class EcommerceDataGenerator:
                     'Aguardando Pagamento', 'Pagamento Aprovado', 'Em Separação',
                     'Em Transporte', 'Entregue', 'Cancelado', 'Devolvido'
                 ]) for _ in range(num_rows)],
-                'Data_Entrega': [fake.date_between(start_date='today', end_date='+30d') 
-                            if random.random() < 0.8 else None for _ in range(num_rows)],
+                'Data_Entrega': with_nulls(random_dates(num_rows, 0, 30), 0.2),
                 'Tempo_Entrega_Dias': [random.randint(1, 30) for _ in range(num_rows)],
-                'Avaliacao_Produto': [random.randint(1, 5) if random.random() < 0.7 else None 
-                                    for _ in range(num_rows)],
+                'Avaliacao_Produto': with_nulls(np_rng.integers(1, 6, num_rows, dtype=np.int8), 0.3),
                 'Comentario': [fake.text(max_nb_chars=100) if random.random() < 0.3 else None 
                             for _ in range(num_rows)],
                 'Dispositivo_Compra': [random.choice([
@@ -532,7 +977,7 @@ class EcommerceDataGenerator:
                 ]) for _ in range(num_rows)]
             }
             
-            return pd.DataFrame(data)
+            return make_table(data, backend)
 
 ###############################
 # Call Center Data Generator
@@ -541,18 +986,25 @@ class EcommerceDataGenerator:
 class CallCenterDataGenerator:
     """Generates sample data for call center business analytics"""
     
+    FACT_KEY = 'CPF_Atendente'
+    DIM_COLUMNS = ['CPF', 'Equipe']
+    FACT_ID = 'Chamada_ID'
+    FACT_DATES = {'Data_Hora_Inicio': (-365, 0)}
+    FACT_RANGES = {
+        'Duracao_Segundos': (30, 3600), 'Tempo_Espera_Segundos': (0, 900), 'Transferencias': (0, 5),
+        'Satisfacao_Cliente': (1, 5), 'Custo_Chamada': (1, 50), 'Valor_Venda': (0, 1000)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with call center agents data"""
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
-            'Data_Nascimento': [fake.date_of_birth(minimum_age=18, maximum_age=60) 
-                              for _ in range(num_rows)],
-            'Data_Contratacao': [fake.date_between(start_date='-5y', end_date='today') 
-                               for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
+            'Data_Nascimento': random_dates(num_rows, -60 * 365, -18 * 365),
+            'Data_Contratacao': random_dates(num_rows, -5 * 365, 0),
             'Nivel': [random.choice([
                 'Júnior', 'Pleno', 'Sênior', 'Especialista', 'Supervisor'
             ]) for _ in range(num_rows)],
@@ -577,19 +1029,18 @@ class CallCenterDataGenerator:
             'Salario': [round(random.uniform(1500, 5000), 2) for _ in range(num_rows)],
             'Meta_Mensal': [random.randint(100, 500) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with call center attendance data"""
-        cpfs = dim_df['CPF'].tolist()
-        equipes = dim_df['Equipe'].tolist()
+        cpfs = column_values(dim_df, 'CPF')
+        equipes = column_values(dim_df, 'Equipe')
         
         data = {
             'CPF_Atendente': [random.choice(cpfs) for _ in range(num_rows)],
             'Chamada_ID': [fake.uuid4() for _ in range(num_rows)],
-            'Data_Hora_Inicio': [fake.date_time_between(start_date='-1y', end_date='now') 
-                               for _ in range(num_rows)],
+            'Data_Hora_Inicio': random_datetimes(num_rows, -365),
             'Duracao_Segundos': [random.randint(30, 3600) for _ in range(num_rows)],
             'Tipo_Chamada': [random.choice([
                 'Receptiva', 'Ativa', 'Transferida', 'Retorno'
@@ -605,8 +1056,7 @@ class CallCenterDataGenerator:
             'Transferencias': [random.randint(0, 5) for _ in range(num_rows)],
             'Resolucao_Primeiro_Contato': [random.choice([True, False]) 
                                          for _ in range(num_rows)],
-            'Satisfacao_Cliente': [random.randint(1, 5) if random.random() < 0.7 else None 
-                                 for _ in range(num_rows)],
+            'Satisfacao_Cliente': with_nulls(np_rng.integers(1, 6, num_rows, dtype=np.int8), 0.3),
             'Protocolo': [f"{fake.random_number(digits=10)}" for _ in range(num_rows)],
             'Canal': [random.choice([
                 'Telefone', 'Chat', 'Email', 'WhatsApp', 'Redes Sociais', 'App'
@@ -622,7 +1072,7 @@ class CallCenterDataGenerator:
                           for _ in range(num_rows)]
         }
         
-        return pd.DataFrame(data)
+        return make_table(data, backend)
 
 ###############################
 # Education Data Generator
@@ -631,16 +1081,23 @@ class CallCenterDataGenerator:
 class EducationDataGenerator:
     """Generates sample data for education business analytics"""
     
+    FACT_KEY = 'CPF_Professor'
+    DIM_COLUMNS = ['CPF', 'Disciplina']
+    FACT_ID = 'Aula_ID'
+    FACT_DATES = {'Data_Aula': (-365, 0)}
+    FACT_RANGES = {
+        'Quantidade_Alunos': (15, 50), 'Presenca_Percentual': (0.5, 1.0), 'Media_Notas': (0, 10)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with education professionals data"""
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
-            'Data_Nascimento': [fake.date_of_birth(minimum_age=25, maximum_age=70) 
-                              for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
+            'Data_Nascimento': random_dates(num_rows, -70 * 365, -25 * 365),
             'Formacao': [random.choice([
                 'Licenciatura', 'Bacharelado', 'Especialização', 
                 'Mestrado', 'Doutorado', 'Pós-Doutorado'
@@ -671,19 +1128,18 @@ class EducationDataGenerator:
                 'Médio', 'Superior', 'Pós-Graduação', 'EJA'
             ]) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with education class data"""
-        cpfs = dim_df['CPF'].tolist()
-        disciplinas = dim_df['Disciplina'].tolist()
+        cpfs = column_values(dim_df, 'CPF')
+        disciplinas = column_values(dim_df, 'Disciplina')
         
         data = {
             'CPF_Professor': [random.choice(cpfs) for _ in range(num_rows)],
             'Aula_ID': [fake.uuid4() for _ in range(num_rows)],
-            'Data_Aula': [fake.date_time_between(start_date='-1y', end_date='now') 
-                        for _ in range(num_rows)],
+            'Data_Aula': random_datetimes(num_rows, -365),
             'Disciplina': [random.choice(disciplinas) for _ in range(num_rows)],
             'Turma': [f"{random.choice(['1º', '2º', '3º', '4º', '5º', '6º', '7º', '8º', '9º'])} {random.choice(['A', 'B', 'C', 'D', 'E'])}" 
                     for _ in range(num_rows)],
@@ -701,8 +1157,7 @@ class EducationDataGenerator:
                 'Apostilas', 'Experimentos', 'Plataforma Digital'
             ]) for _ in range(num_rows)],
             'Avaliacao_Aplicada': [random.choice([True, False]) for _ in range(num_rows)],
-            'Media_Notas': [round(random.uniform(0, 10), 1) if random.random() < 0.7 else None 
-                          for _ in range(num_rows)],
+            'Media_Notas': with_nulls(np.round(np_rng.uniform(0, 10, num_rows), 1), 0.3),
             'Participacao_Alunos': [random.choice([
                 'Baixa', 'Média', 'Alta', 'Excelente'
             ]) for _ in range(num_rows)],
@@ -715,7 +1170,7 @@ class EducationDataGenerator:
                           for _ in range(num_rows)]
         }
         
-        return pd.DataFrame(data)
+        return make_table(data, backend)
 
 ###############################
 # Real Estate Data Generator
@@ -724,18 +1179,34 @@ class EducationDataGenerator:
 class RealEstateDataGenerator:
     """Generates sample data for real estate business analytics"""
     
+    FACT_KEY = 'CPF_Corretor'
+    DIM_COLUMNS = ['CPF', 'Comissao_Percentual']
+    FACT_ID = 'Transacao_ID'
+    FACT_DATES = {'Data_Transacao': (-365, 0)}
+    FACT_RANGES = {
+        'Area_M2': (30, 1000), 'Quartos': (0, 6), 'Banheiros': (1, 6),
+        'Vagas_Garagem': (0, 6), 'Valor_Anunciado': (100000, 5000000), 'Tempo_Anuncio_Dias': (1, 365),
+        'Visitas_Realizadas': (0, 50), 'Propostas_Recebidas': (0, 10)
+    }
+    
+    # Closing price is negotiated down from the listing; commission uses the agent's rate
+    DERIVED_FACTS = {
+        'Valor_Transacao': lambda c: np.round(
+            c['Valor_Anunciado'] * np_rng.uniform(0.85, 1.0, len(c['Valor_Anunciado'])), 2),
+        'Comissao_Valor': lambda c: np.round(c['Valor_Transacao'] * c['Comissao_Percentual'] / 100, 2)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with real estate agents data"""
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
             'CRECI': [f"{random.randint(10000, 99999)}-{fake.estado_sigla()}" 
                     for _ in range(num_rows)],
-            'Data_Admissao': [fake.date_between(start_date='-10y', end_date='today') 
-                            for _ in range(num_rows)],
+            'Data_Admissao': random_dates(num_rows, -10 * 365, 0),
             'Regiao_Atuacao': [random.choice([
                 'Zona Sul', 'Zona Norte', 'Zona Leste', 'Zona Oeste', 
                 'Centro', 'Região Metropolitana', 'Litoral', 'Interior'
@@ -759,43 +1230,45 @@ class RealEstateDataGenerator:
                 'Ativo', 'Férias', 'Afastado', 'Treinamento', 'Desligado'
             ]) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with real estate transaction data"""
-        cpfs = dim_df['CPF'].tolist()
+        cpfs = np.asarray(column_values(dim_df, 'CPF'), dtype=object)
+        comissoes = np.asarray(column_values(dim_df, 'Comissao_Percentual'), dtype=np.float64)
+        
+        # One agent index per row picks both the agent and their commission rate
+        corretores = np_rng.integers(0, len(cpfs), num_rows)
         
+        estados, cidades, ceps = random_addresses(num_rows)
         data = {
-            'CPF_Corretor': [random.choice(cpfs) for _ in range(num_rows)],
+            'CPF_Corretor': cpfs[corretores],
             'Transacao_ID': [fake.uuid4() for _ in range(num_rows)],
-            'Data_Transacao': [fake.date_time_between(start_date='-1y', end_date='now') 
-                             for _ in range(num_rows)],
+            'Data_Transacao': random_datetimes(num_rows, -365),
             'Tipo_Imovel': [random.choice([
                 'Apartamento', 'Casa', 'Sobrado', 'Terreno', 'Sala Comercial', 
                 'Galpão', 'Loja', 'Cobertura', 'Flat', 'Sítio', 'Fazenda'
             ]) for _ in range(num_rows)],
             'Endereco': [fake.street_address() for _ in range(num_rows)],
             'Bairro': [fake.bairro() for _ in range(num_rows)],
-            'Cidade': [fake.city() for _ in range(num_rows)],
-            'Estado': [fake.estado_sigla() for _ in range(num_rows)],
-            'CEP': [fake.postcode() for _ in range(num_rows)],
+            'Cidade': cidades,
+            'Estado': estados,
+            'CEP': ceps,
             'Area_M2': [random.randint(30, 1000) for _ in range(num_rows)],
             'Quartos': [random.randint(0, 6) for _ in range(num_rows)],
             'Banheiros': [random.randint(1, 6) for _ in range(num_rows)],
             'Vagas_Garagem': [random.randint(0, 6) for _ in range(num_rows)],
             'Valor_Anunciado': [round(random.uniform(100000, 5000000), 2) 
                               for _ in range(num_rows)],
-            'Valor_Transacao': [round(random.uniform(90000, 4800000), 2) 
-                              for _ in range(num_rows)],
+            'Valor_Transacao': DERIVED,
             'Tipo_Transacao': [random.choice([
                 'Venda', 'Aluguel', 'Temporada', 'Permuta', 'Arrendamento'
             ]) for _ in range(num_rows)],
             'Tempo_Anuncio_Dias': [random.randint(1, 365) for _ in range(num_rows)],
             'Visitas_Realizadas': [random.randint(0, 50) for _ in range(num_rows)],
             'Propostas_Recebidas': [random.randint(0, 10) for _ in range(num_rows)],
-            'Comissao_Valor': [round(random.uniform(3000, 150000), 2) 
-                             for _ in range(num_rows)],
+            'Comissao_Valor': DERIVED,
             'Financiamento': [random.choice([True, False]) for _ in range(num_rows)],
             'Banco_Financiador': [random.choice([
                 'Caixa', 'Banco do Brasil', 'Itaú', 'Bradesco', 
@@ -810,7 +1283,10 @@ class RealEstateDataGenerator:
             ]) for _ in range(num_rows)]
         }
         
-        return pd.DataFrame(data)
+        return make_table(apply_derived_columns(
+            data, RealEstateDataGenerator.DERIVED_FACTS,
+            Comissao_Percentual=comissoes[corretores]
+        ), backend)
 
 ###############################
 # Supply Chain Data Generator
@@ -819,14 +1295,24 @@ class RealEstateDataGenerator:
 class SupplyChainDataGenerator:
     """Generates sample data for supply chain business analytics"""
     
+    FACT_KEY = 'CPF_Responsavel'
+    DIM_COLUMNS = ['CPF']
+    FACT_ID = 'Operacao_ID'
+    FACT_DATES = {'Data_Operacao': (-365, 0)}
+    FACT_RANGES = {
+        'Quantidade': (1, 10000), 'Valor_Unitario': (0.5, 5000), 'Valor_Total': (100, 500000),
+        'Custo_Frete': (10, 10000), 'Prazo_Entrega_Dias': (1, 90), 'Lead_Time_Dias': (1, 120),
+        'Nivel_Servico': (0.7, 1.0)
+    }
+    
     @staticmethod
-    def generate_dimension(num_rows: int = NUM_ROWS_DIM) -> pd.DataFrame:
+    def generate_dimension(num_rows: int = NUM_ROWS_DIM, backend: str = 'pandas') -> Table:
         """Generate dimension table with supply chain professionals data"""
         data = {
-            'CPF': [generate_cpf() for _ in range(num_rows)],
-            'Nome': [fake.name() for _ in range(num_rows)],
-            'Email': [fake.email() for _ in range(num_rows)],
-            'Telefone': [fake.phone_number() for _ in range(num_rows)],
+            'CPF': unique_cpfs(num_rows),
+            'Nome': unique_names(num_rows),
+            'Email': unique_emails(num_rows),
+            'Telefone': unique_phones(num_rows),
             'Departamento': [random.choice([
                 'Compras', 'Logística', 'Armazenagem', 'Distribuição', 
                 'Planejamento', 'Importação', 'Qualidade', 'Produção'
@@ -835,8 +1321,7 @@ class SupplyChainDataGenerator:
                 'Analista Jr', 'Analista Pleno', 'Analista Sênior', 
                 'Coordenador', 'Gerente', 'Diretor', 'Operador'
             ]) for _ in range(num_rows)],
-            'Data_Admissao': [fake.date_between(start_date='-8y', end_date='today') 
-                            for _ in range(num_rows)],
+            'Data_Admissao': random_dates(num_rows, -8 * 365, 0),
             'Centro_Distribuicao': [f"CD {random.choice(['Norte', 'Sul', 'Leste', 'Oeste', 'Central'])}" 
                                   for _ in range(num_rows)],
             'Nivel_Acesso': [random.choice([
@@ -850,18 +1335,17 @@ class SupplyChainDataGenerator:
             ]) for _ in range(num_rows)],
             'Salario': [round(random.uniform(2000, 20000), 2) for _ in range(num_rows)]
         }
-        return pd.DataFrame(data)
+        return make_table(data, backend)
     
     @staticmethod
-    def generate_facts(dim_df: pd.DataFrame, num_rows: int) -> pd.DataFrame:
+    def generate_facts(dim_df: Table, num_rows: int, backend: str = 'pandas') -> Table:
         """Generate fact table with supply chain operation data"""
-        cpfs = dim_df['CPF'].tolist()
+        cpfs = column_values(dim_df, 'CPF')
         
         data = {
             'CPF_Responsavel': [random.choice(cpfs) for _ in range(num_rows)],
             'Operacao_ID': [fake.uuid4() for _ in range(num_rows)],
-            'Data_Operacao': [fake.date_time_between(start_date='-1y', end_date='now') 
-                            for _ in range(num_rows)],
+            'Data_Operacao': random_datetimes(num_rows, -365),
             'Tipo_Operacao': [random.choice([
                 'Recebimento', 'Expedição', 'Transferência', 'Inventário', 
                 'Devolução', 'Descarte', 'Produção', 'Importação'
@@ -905,13 +1389,180 @@ class SupplyChainDataGenerator:
             'Nivel_Servico': [round(random.uniform(0.7, 1.0), 2) for _ in range(num_rows)]
         }
         
-        return pd.DataFrame(data)
+        return make_table(data, backend)
+
+###############################
+# CSV Writer
+###############################
+
+# Rows formatted per chunk and buffer size used when writing CSV files
+CSV_CHUNK_ROWS = 50000
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+
+CSV_COMPRESSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+def _replace_path(path: str) -> None:
+    """Remove an existing output file, so writing never goes through a hard link (see OutputCache)"""
+    if os.path.lexists(path):
+        os.remove(path)
+
+def _format_csv_chunk(chunk: pd.DataFrame, header: bool, compression: Optional[str], level: int) -> bytes:
+    """Format one chunk as CSV bytes, gzip-compressing it when requested"""
+    data = chunk.to_csv(index=False, header=header).encode('utf-8')
+    if compression == 'gzip':
+        # Each chunk becomes its own gzip member; concatenated members are a valid gzip file
+        return gzip.compress(data, compresslevel=level)
+    return data
+
+def _run_now(function: Callable[..., Any], *args: Any) -> Future:
+    """Run a function in the calling thread, as a finished Future"""
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+def write_csv(df: Table, path_or_buffer: Any, compression: Optional[str] = None,
+              chunk_rows: int = CSV_CHUNK_ROWS, workers: Optional[int] = None,
+              use_processes: bool = True, level: Optional[int] = None) -> None:
+    """
+    Write a table as CSV, formatting chunks in parallel
+    
+    Chunks are formatted (and gzip-compressed) concurrently but written
+    strictly in order through a large buffer, with at most a few chunks
+    in flight so memory stays bounded. DataFrame.to_csv holds the GIL, so
+    chunks are formatted in worker processes by default; a table of a
+    single chunk (or a single worker) is formatted in-process.
+    
+    Parameters:
+    -----------
+    df : Table
+        Table to write (Arrow and Polars tables are converted one chunk at a time)
+    path_or_buffer : str or binary file object
+        Destination path, '-' for standard output, or an open binary file
+    compression : str, optional
+        None, 'gzip' or 'zstd' (zstd requires the zstandard package and
+        compresses with its own worker threads)
+    chunk_rows : int
+        Number of rows formatted per chunk
+    workers : int, optional
+        Number of formatting workers (default: CPU count)
+    use_processes : bool
+        Format chunks in worker processes (default) rather than threads,
+        which only overlap the gzip compression
+    level : int, optional
+        Compression level (default: 6 for gzip, 3 for zstd)
+    """
+    if compression not in CSV_COMPRESSIONS:
+        raise ValueError(f"Compression '{compression}' not supported. Available options: gzip, zstd")
+    if compression == 'zstd' and zstandard is None:
+        raise ImportError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+    
+    workers = workers or os.cpu_count() or 1
+    if level is None:
+        level = 3 if compression == 'zstd' else 6
+    
+    with contextlib.ExitStack() as stack:
+        if path_or_buffer == '-':
+            sink = sys.stdout.buffer
+        elif isinstance(path_or_buffer, (str, os.PathLike)):
+            _replace_path(path_or_buffer)
+            sink = stack.enter_context(open(path_or_buffer, 'wb', buffering=WRITE_BUFFER_SIZE))
+        else:
+            sink = path_or_buffer
+        
+        if compression == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+            sink = stack.enter_context(compressor.stream_writer(sink, closefd=False))
+        
+        chunk_compression = 'gzip' if compression == 'gzip' else None
+        starts = range(0, max(len(df), 1), chunk_rows)
+        if workers > 1 and len(starts) > 1:
+            if use_processes:
+                # Workers only format pandas chunks, but Polars' thread pool does not survive fork
+                polars_table = pl is not None and isinstance(df, pl.DataFrame)
+                executor = ProcessPoolExecutor(max_workers=workers,
+                                               mp_context=process_context('polars' if polars_table else 'pandas'))
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers)
+            submit = stack.enter_context(executor).submit
+        else:
+            submit = _run_now
+        
+        # Keep a bounded window of pending chunks and write them back in order
+        pending = deque()
+        for start in starts:
+            if len(pending) >= workers * 2:
+                sink.write(pending.popleft().result())
+            chunk = to_pandas(slice_table(df, start, start + chunk_rows))
+            pending.append(submit(_format_csv_chunk, chunk, start == 0, chunk_compression, level))
+        while pending:
+            sink.write(pending.popleft().result())
+        sink.flush()
+
+# Columnar file formats and their extensions
+FILE_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'ipc': '.arrow'}
+
+def write_table(df: Table, path: str, file_format: str = 'parquet', compression: Optional[str] = None) -> None:
+    """
+    Write a table as a Parquet or Arrow IPC file
+    
+    Arrow and Polars tables are handed to the writer without a copy; pandas
+    DataFrames are converted first.
+    
+    Parameters:
+    -----------
+    df : Table
+        Table to write
+    path : str
+        Destination path
+    file_format : str
+        'parquet' or 'ipc' (the Arrow IPC file format, readable with memory mapping)
+    compression : str, optional
+        Column compression: 'gzip' or 'zstd' for Parquet (default: snappy),
+        'zstd' for IPC (default: none)
+    """
+    if file_format not in ('parquet', 'ipc'):
+        raise ValueError(f"File format '{file_format}' not supported. Available options: parquet, ipc")
+    check_output_packages(file_format=file_format)
+    table = to_arrow(df)
+    _replace_path(path)
+    
+    if file_format == 'parquet':
+        pq.write_table(table, path, compression=compression or 'snappy')
+        return
+    
+    if compression not in (None, 'zstd'):
+        raise ValueError(f"Compression '{compression}' not supported for IPC files. Available options: zstd")
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
 
 ###############################
 # Main Function
 ###############################
 
-def generate_data(business_case: str, num_dim_rows: int = NUM_ROWS_DIM, num_fact_rows: int = NUM_ROWS_FACT) -> tuple:
+GENERATORS = {
+    'restaurant': FastFoodDataGenerator,
+    'marketing': MarketingDataGenerator,
+    'banking': BankingDataGenerator,
+    'healthcare': HealthcareDataGenerator,
+    'ecommerce': EcommerceDataGenerator,
+    'callcenter': CallCenterDataGenerator,
+    'education': EducationDataGenerator,
+    'realestate': RealEstateDataGenerator,
+    'supplychain': SupplyChainDataGenerator
+}
+
+def set_seed(seed: Optional[int] = None) -> None:
+    """Seed the shared random and Faker state (None reseeds from the OS)"""
+    global np_rng
+    random.seed(seed)
+    fake.seed_instance(seed)
+    np_rng = np.random.default_rng(seed)
+
+def generate_data(business_case: str, num_dim_rows: int = NUM_ROWS_DIM, num_fact_rows: int = NUM_ROWS_FACT,
+                  seed: Optional[int] = None, fact_workers: Optional[int] = None,
+                  reference_time: Optional[datetime] = None, backend: str = 'pandas',
+                  dim_from: Optional[str] = None) -> tuple:
     """
     Generate dimension and fact tables for a specific business case
     
@@ -923,106 +1574,2220 @@ def generate_data(business_case: str, num_dim_rows: int = NUM_ROWS_DIM, num_fact
         Number of rows to generate for dimension table
     num_fact_rows : int
         Number of rows to generate for fact table
+    seed : int, optional
+        Seed for reproducible output (default: no reseeding); seeded fact rows
+        can be regenerated on their own with generate_rows
+    fact_workers : int, optional
+        Generate the fact table on this many worker processes (default: in-process)
+    reference_time : datetime, optional
+        'Now' for the generated dates when seeded (see generate_rows)
+    backend : str
+        'pandas' (default), 'arrow' for pyarrow Tables or 'polars' for polars
+        DataFrames; the columnar backends skip building pandas frames
+    dim_from : str, optional
+        Generate facts against this existing dimension file instead of a new
+        dimension (see load_dimension); num_dim_rows is then ignored
         
     Returns:
     --------
     tuple
         (dimension_df, fact_df)
     """
-    generators = {
-        'restaurant': FastFoodDataGenerator,
-        'marketing': MarketingDataGenerator,
-        'banking': BankingDataGenerator,
-        'healthcare': HealthcareDataGenerator,
-        'ecommerce': EcommerceDataGenerator,
-        'callcenter': CallCenterDataGenerator,
-        'education': EducationDataGenerator,
-        'realestate': RealEstateDataGenerator,
-        'supplychain': SupplyChainDataGenerator
-    }
+    if business_case.lower() not in GENERATORS:
+        raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(GENERATORS.keys())}")
+    check_backend(backend)
     
-    if business_case.lower() not in generators:
-        raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(generators.keys())}")
+    generator = GENERATORS[business_case.lower()]
     
-    generator = generators[business_case.lower()]
+    if seed is not None:
+        set_seed(seed)
     
-    print(f"Generating {num_dim_rows} dimension rows for {business_case}...")
-    dim_df = generator.generate_dimension(num_dim_rows)
+    if dim_from:
+        dim_df = load_dimension(dim_from, business_case, backend)
+    else:
+        print(f"Generating {num_dim_rows} dimension rows for {business_case}...")
+        if seed is not None:
+            with pinned_reference_time(reference_time):
+                dim_df = generator.generate_dimension(num_dim_rows, backend)
+        else:
+            dim_df = generator.generate_dimension(num_dim_rows, backend)
     
     print(f"Generating {num_fact_rows} fact rows for {business_case}...")
-    fact_df = generator.generate_facts(dim_df, num_fact_rows)
+    if fact_workers and fact_workers > 1:
+        fact_df = generate_facts_parallel(business_case, dim_df, num_fact_rows, workers=fact_workers, seed=seed,
+                                          reference_time=reference_time, backend=backend)
+    elif seed is not None:
+        fact_df = generate_rows(business_case, dim_df, 0, num_fact_rows, seed, reference_time, backend=backend)
+        if backend == 'pandas':
+            fact_df = fact_df.reset_index(drop=True)
+    else:
+        fact_df = generator.generate_facts(dim_df, num_fact_rows, backend)
     
     return dim_df, fact_df
 
-def save_data(dim_df: pd.DataFrame, fact_df: pd.DataFrame, business_case: str, output_dir: str = '.') -> None:
+def save_data(dim_df: Optional[Table], fact_df: Table, business_case: str, output_dir: str = '.',
+              compression: Optional[str] = None, workers: Optional[int] = None, fact_suffix: str = '',
+              file_format: str = 'csv', use_processes: bool = True) -> List[str]:
     """
-    Save dimension and fact tables to CSV files
+    Save dimension and fact tables to CSV, Parquet or Arrow IPC files
     
     Parameters:
     -----------
-    dim_df : pd.DataFrame
-        Dimension table
-    fact_df : pd.DataFrame
+    dim_df : Table, optional
+        Dimension table (None saves only the fact table)
+    fact_df : Table
         Fact table
     business_case : str
         The business case name
     output_dir : str
         Directory to save the files
+    compression : str, optional
+        None, 'gzip' or 'zstd' (for CSV adds .gz / .zst to the file names;
+        for Parquet and IPC compresses the columns, see write_table)
+    workers : int, optional
+        Number of CSV formatting workers (default: CPU count)
+    fact_suffix : str
+        Added to the fact file name, e.g. '.rows-0-1000' for a partial fact table
+    file_format : str
+        'csv' (default), 'parquet' or 'ipc'
+    use_processes : bool
+        Format CSV chunks in worker processes rather than threads (see write_csv)
+        
+    Returns:
+    --------
+    List[str]
+        Paths of the saved files, dimension first
     """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"File format '{file_format}' not supported. Available options: {', '.join(FILE_FORMATS)}")
+    
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
+    extension = FILE_FORMATS[file_format]
+    if file_format == 'csv':
+        extension += CSV_COMPRESSIONS.get(compression, '')
+    
+    paths = []
+    for table, df, suffix in (('Dimension', dim_df, ''), ('Fact', fact_df, fact_suffix)):
+        if df is None:
+            continue
+        name = 'dimension' if table == 'Dimension' else 'facts'
+        path = os.path.join(output_dir, f"{business_case}_{name}{suffix}{extension}")
+        if file_format == 'csv':
+            write_csv(df, path, compression=compression, workers=workers, use_processes=use_processes)
+        else:
+            write_table(df, path, file_format, compression)
+        print(f"{table} table saved to {path}")
+        paths.append(path)
+    return paths
+
+def load_dimension(path: str, business_case: str, backend: str = 'pandas') -> Table:
+    """
+    Load an existing dimension file for fact generation
+    
+    Only the columns the business case's generate_facts reads (its
+    DIM_COLUMNS) are loaded. Arrow IPC files are memory-mapped, so with the
+    'arrow' and 'polars' backends those columns are used straight from the
+    page cache; Parquet and CSV files are read column-selectively.
+    
+    Parameters:
+    -----------
+    path : str
+        Dimension file: CSV (optionally .gz/.zst compressed), .parquet or .arrow
+    business_case : str
+        The business case whose facts will be generated
+    backend : str
+        Table backend to return (see generate_data)
+        
+    Returns:
+    --------
+    Table
+        The dimension's DIM_COLUMNS
+    """
+    business_case = business_case.lower()
+    if business_case not in GENERATORS:
+        raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(GENERATORS.keys())}")
+    check_backend(backend)
+    columns = GENERATORS[business_case].DIM_COLUMNS
+    
+    available = set(_file_columns(path))
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Dimension file {path} lacks the columns {', '.join(missing)} needed by {business_case}")
+    
+    print(f"Loading dimension columns {', '.join(columns)} from {path}...")
+    if path.endswith('.arrow'):
+        check_backend('arrow')
+        # The table keeps the mapping alive; nothing is read until the columns are used
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all().select(columns)
+    elif path.endswith('.parquet'):
+        check_backend('arrow')
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    elif pa_csv is not None:
+        table = pa_csv.read_csv(pa.input_stream(path, compression='detect'),
+                                convert_options=pa_csv.ConvertOptions(include_columns=columns))
+    else:
+        table = pd.read_csv(path, usecols=columns)
+    
+    if len(table) == 0:
+        raise ValueError(f"Dimension file {path} has no rows")
+    if isinstance(table, pd.DataFrame):
+        return make_table({name: table[name].to_numpy() for name in columns}, backend)
+    if backend == 'pandas':
+        return to_pandas(table)
+    return table if backend == 'arrow' else pl.from_arrow(table)
+
+###############################
+# Batch Generation
+###############################
+
+def parse_business_cases(value: str) -> List[str]:
+    """Parse 'all' or a comma-separated list of business cases"""
+    if value.strip().lower() == 'all':
+        return list(GENERATORS.keys())
+    
+    cases = [case.strip().lower() for case in value.split(',') if case.strip()]
+    unknown = [case for case in cases if case not in GENERATORS]
+    if not cases or unknown:
+        raise ValueError(f"Business case '{', '.join(unknown) or value}' not supported. Available options: all, {', '.join(GENERATORS.keys())}")
+    
+    # Keep the first occurrence of each case, in the order given
+    return list(dict.fromkeys(cases))
+
+def _warm_worker() -> None:
+    """Pool initializer: load Faker providers once per worker process"""
+    set_seed(None)
+    fake.name(), fake.email(), fake.phone_number(), fake.city(), fake.uuid4()
+    fake.street_address(), fake.date_between(start_date='-5y', end_date='today')
+
+def _batch_worker(business_case: str, num_dim_rows: int, num_fact_rows: int, output_dir: Optional[str],
+                  seed: Optional[int], compression: Optional[str], backend: str, file_format: str,
+                  reference_time: Optional[datetime], fact_workers: Optional[int],
+                  use_processes: bool) -> Dict[str, Any]:
+    """Generate (and optionally save) one business case inside a pool worker"""
+    if seed is None:
+        # Forked workers would otherwise share the parent's random state
+        set_seed(None)
     
-    # Save dimension table
-    dim_path = os.path.join(output_dir, f"{business_case}_dimension.csv")
-    dim_df.to_csv(dim_path, index=False)
-    print(f"Dimension table saved to {dim_path}")
-    
-    # Save fact table
-    fact_path = os.path.join(output_dir, f"{business_case}_facts.csv")
-    fact_df.to_csv(fact_path, index=False)
-    print(f"Fact table saved to {fact_path}")
-
-def gerar_categoria_e_estabelecimento():
-    """Generate a random purchase category and establishment"""
-    categorias = {
-        'Alimentação': ['Supermercado Pão de Açúcar', 'Restaurante Outback', 'McDonald\'s', 'Padaria São Paulo', 'iFood'],
-        'Transporte': ['Uber', '99 Táxi', 'Posto Ipiranga', 'Estacionamento Shopping', 'Metrô SP'],
-        'Saúde': ['Drogaria São Paulo', 'Farmácia Raia', 'Academia SmartFit', 'Clínica Einstein', 'Ultrafarma'],
-        'Educação': ['Livraria Cultura', 'Curso Alura', 'Udemy', 'Faculdade Anhembi', 'Escola de Idiomas'],
-        'Lazer': ['Cinema Cinemark', 'Netflix', 'Spotify', 'Teatro Municipal', 'Parque Hopi Hari'],
-        'Vestuário': ['Renner', 'C&A', 'Zara', 'Nike Store', 'Adidas'],
-        'Casa': ['Casas Bahia', 'Magazine Luiza', 'Leroy Merlin', 'Tok&Stok', 'Cobasi'],
-        'Tecnologia': ['Amazon', 'Apple Store', 'Samsung Store', 'Fast Shop', 'Kabum'],
-        'Serviços': ['Salão de Beleza', 'Lavanderia 5àSec', 'Conserto Celular', 'Advocacia', 'Seguro Auto'],
-        'Viagem': ['Decolar.com', 'Booking.com', 'Hotel Ibis', 'Gol Linhas Aéreas', 'Airbnb']
+    start = time.perf_counter()
+    dim_df, fact_df = generate_data(business_case, num_dim_rows, num_fact_rows, seed=seed, fact_workers=fact_workers,
+                                    reference_time=reference_time, backend=backend)
+    generation_time = time.perf_counter() - start
+    
+    result = {
+        'business_case': business_case,
+        'dim_rows': len(dim_df),
+        'fact_rows': len(fact_df),
+        'generation_seconds': generation_time,
+        'save_seconds': 0.0
     }
     
-    categoria = random.choice(list(categorias.keys()))
-    estabelecimento = random.choice(categorias[categoria])
+    if output_dir is None:
+        # Without an output directory the frames travel back to the caller
+        result['dim_df'] = dim_df
+        result['fact_df'] = fact_df
+    else:
+        start = time.perf_counter()
+        save_data(dim_df, fact_df, business_case, output_dir, compression=compression, file_format=file_format,
+                  use_processes=use_processes)
+        result['save_seconds'] = time.perf_counter() - start
     
-    return categoria, estabelecimento
+    return result
 
-if __name__ == "__main__":
-    # Set up command line arguments
-    parser = argparse.ArgumentParser(description='Generate synthetic business data for analytics')
-    parser.add_argument('business_case', type=str, help='Business case to generate data for')
-    parser.add_argument('--dim-rows', type=int, default=NUM_ROWS_DIM, 
-                        help=f'Number of dimension rows (default: {NUM_ROWS_DIM})')
-    parser.add_argument('--fact-rows', type=int, default=NUM_ROWS_FACT, 
-                        help=f'Number of fact rows (default: {NUM_ROWS_FACT})')
-    parser.add_argument('--output-dir', type=str, default='data', 
-                        help='Directory to save output files (default: data)')
+def generate_batch(business_cases: List[str], num_dim_rows: int = NUM_ROWS_DIM, num_fact_rows: int = NUM_ROWS_FACT,
+                   output_dir: Optional[str] = None, seed: Optional[int] = None,
+                   max_workers: Optional[int] = None, compression: Optional[str] = None,
+                   backend: str = 'pandas', file_format: str = 'csv',
+                   reference_time: Optional[datetime] = None, fact_workers: Optional[int] = None,
+                   use_processes: bool = True) -> List[Dict[str, Any]]:
+    """
+    Generate several business cases concurrently on a process pool
     
-    args = parser.parse_args()
+    Workers are started once and reused across business cases, so Faker
+    setup is paid per worker instead of per business case.
     
-    # Generate and save data
-    try:
-        dim_df, fact_df = generate_data(args.business_case, args.dim_rows, args.fact_rows)
-        save_data(dim_df, fact_df, args.business_case, args.output_dir)
-        print(f"Successfully generated data for {args.business_case} business case!")
-    except Exception as e:
-        print(f"Error generating data: {e}")
-        sys.exit(1)
+    Parameters:
+    -----------
+    business_cases : List[str]
+        Business cases to generate (see parse_business_cases)
+    num_dim_rows : int
+        Number of rows to generate for each dimension table
+    num_fact_rows : int
+        Number of rows to generate for each fact table
+    output_dir : str, optional
+        Directory to save the files; when omitted the tables are
+        returned in the 'dim_df' and 'fact_df' keys of each result
+    seed : int, optional
+        Base seed; each business case gets seed plus its position in GENERATORS,
+        so its output does not depend on the other cases in the batch
+    max_workers : int, optional
+        Number of worker processes (default: one per business case, up to the CPU count)
+    compression : str, optional
+        Compression passed to save_data
+    backend : str
+        Table backend passed to generate_data
+    file_format : str
+        File format passed to save_data
+    reference_time : datetime, optional
+        'Now' for the generated dates when seeded (see generate_data)
+    fact_workers : int, optional
+        Worker processes for each fact table (see generate_data)
+    use_processes : bool
+        Format CSV chunks in worker processes rather than threads (see write_csv)
+        
+    Returns:
+    --------
+    List[Dict[str, Any]]
+        One summary per business case, in the order given
+    """
+    for business_case in business_cases:
+        if business_case.lower() not in GENERATORS:
+            raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(GENERATORS.keys())}")
+    
+    if max_workers is None:
+        max_workers = min(len(business_cases), os.cpu_count() or 1)
+    
+    with ProcessPoolExecutor(max_workers=max(max_workers, 1), initializer=_warm_worker,
+                             mp_context=process_context(backend)) as executor:
+        futures = [
+            executor.submit(_batch_worker, business_case.lower(), num_dim_rows, num_fact_rows, output_dir,
+                            None if seed is None else seed + list(GENERATORS).index(business_case.lower()),
+                            compression, backend, file_format, reference_time, fact_workers, use_processes)
+            for business_case in business_cases
+        ]
+        return [future.result() for future in futures]
 
+def print_batch_summary(results: List[Dict[str, Any]], elapsed: Optional[float] = None) -> None:
+    """Print a combined summary of rows and timings for a batch run"""
+    print(f"{'Business case':<14} {'Dim rows':>10} {'Fact rows':>12} {'Generate (s)':>13} {'Save (s)':>9}")
+    for result in results:
+        print(f"{result['business_case']:<14} {result['dim_rows']:>10} {result['fact_rows']:>12} "
+              f"{result['generation_seconds']:>13.2f} {result['save_seconds']:>9.2f}")
+    
+    total_dim = sum(result['dim_rows'] for result in results)
+    total_fact = sum(result['fact_rows'] for result in results)
+    total_time = sum(result['generation_seconds'] + result['save_seconds'] for result in results)
+    print(f"{'Total':<14} {total_dim:>10} {total_fact:>12} {total_time:>13.2f} (worker time)")
+    if elapsed is not None:
+        print(f"Wall time: {elapsed:.2f}s")
+
+###############################
+# Anomaly Injection
+###############################
 
+ANOMALIES = ['duplicates', 'late_arriving', 'orphan_keys', 'malformed_cpf', 'malformed_cep', 'outliers', 'encoding']
+
+def parse_anomaly_rates(value: str) -> Dict[str, float]:
+    """Parse 'name=rate,name=rate' (e.g. 'duplicates=0.01,orphan_keys=0.005')"""
+    rates = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        name, _, rate = item.partition('=')
+        name = name.strip()
+        if name not in ANOMALIES:
+            raise ValueError(f"Anomaly '{name}' not supported. Available options: {', '.join(ANOMALIES)}")
+        try:
+            rates[name] = float(rate)
+        except ValueError:
+            raise ValueError(f"Invalid rate for anomaly '{name}': '{rate}'")
+        if not 0 <= rates[name] <= 1:
+            raise ValueError(f"Rate for anomaly '{name}' must be between 0 and 1")
+    return rates
+
+def _string_chars(values: np.ndarray) -> np.ndarray:
+    """View fixed-width strings as an (n, width) array of single characters"""
+    values = values.astype(str)
+    return values.view('U1').reshape(len(values), -1)
+
+def _malform(values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Break formatted codes (CPF, CEP) three ways: bad last digit, no punctuation, truncated"""
+    values = values.astype(str)
+    mode = rng.integers(0, 3, len(values))
+    
+    if (mode == 0).any():
+        bad_digit = _string_chars(values[mode == 0]).copy()
+        last = np.char.str_len(values[mode == 0]) - 1
+        rows = np.arange(len(bad_digit))
+        digits = np.char.isdigit(bad_digit[rows, last])
+        bad_digit[rows[digits], last[digits]] = (
+            (bad_digit[rows[digits], last[digits]].astype(int) + 1) % 10).astype(str)
+        values[mode == 0] = bad_digit.view(f'U{bad_digit.shape[1]}').ravel()
+    if (mode == 1).any():
+        values[mode == 1] = np.char.replace(np.char.replace(values[mode == 1], '.', ''), '-', '')
+    if (mode == 2).any():
+        values[mode == 2] = [value[:-2] for value in values[mode == 2]]
+    return values.astype(object)
 
+def inject_anomalies(df: pd.DataFrame, rates: Dict[str, float], key_column: Optional[str] = None,
+                     dim_keys: Optional[Any] = None, seed: Optional[int] = None,
+                     date_column: Optional[str] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Inject dirty data into a generated table for pipeline stress tests
+    
+    Every anomaly selects its rows in bulk and edits whole column slices:
+    duplicates (copies appended at the end), late_arriving (date_column, the
+    event date of a fact table, moved 400-1000 days before the window), orphan_keys (key replaced by a valid
+    CPF absent from the dimension), malformed_cpf / malformed_cep (bad check
+    digit, missing punctuation or truncated), outliers (Valor_* amounts
+    multiplied by 100-1000) and encoding (UTF-8 text decoded as Latin-1, or
+    a replacement character appended to plain ASCII; null cells are left
+    alone). Anomalies whose column does not exist in the table are skipped.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Table returned by generate_facts or generate_dimension
+    rates : Dict[str, float]
+        Fraction of rows per anomaly (see ANOMALIES)
+    key_column : str, optional
+        CPF column used by orphan_keys and malformed_cpf (default: 'CPF' if present)
+    dim_keys : array-like, optional
+        Dimension CPFs that orphan keys must avoid
+    seed : int, optional
+        Seed for reproducible injection
+    date_column : str, optional
+        Event date column moved by late_arriving (required for that anomaly;
+        e.g. the first of a generator's FACT_DATES)
+        
+    Returns:
+    --------
+    tuple
+        (dirty_df, manifest) where the manifest lists, per anomaly, the
+        affected column and 0-based row positions in dirty_df (encoding
+        glitches list their column per row, duplicates their source rows)
+    """
+    unknown = [name for name in rates if name not in ANOMALIES]
+    if unknown:
+        raise ValueError(f"Anomaly '{', '.join(unknown)}' not supported. Available options: {', '.join(ANOMALIES)}")
+    if rates.get('late_arriving') and date_column is None:
+        raise ValueError("late_arriving needs the event date column (date_column) and applies to fact tables only")
+    
+    rng = np.random.default_rng(seed) if seed is not None else np_rng
+    key_column = key_column or ('CPF' if 'CPF' in df.columns else None)
+    rows_before = len(df)
+    df = df.reset_index(drop=True)
+    manifest = {'rows_before': rows_before, 'rates': dict(rates), 'anomalies': {}}
+    
+    def pick(name: str, population: int) -> np.ndarray:
+        count = min(int(round(rates.get(name, 0) * population)), population)
+        return np.sort(rng.choice(population, count, replace=False)) if count else np.empty(0, dtype=np.int64)
+    
+    def record(name: str, column: Optional[str], rows: np.ndarray, **extra: Any) -> None:
+        if len(rows):
+            manifest['anomalies'][name] = {'column': column, 'rows': rows.tolist(), **extra}
+    
+    amounts = [name for name in df.columns if name.startswith('Valor') and df[name].dtype.kind == 'f']
+    texts = [name for name in df.columns
+             if df[name].dtype.kind in 'OSU' or isinstance(df[name].dtype, pd.StringDtype)]
+    texts = [name for name in texts if name not in (key_column, 'CEP') and not name.endswith('_ID')]
+    
+    if date_column in df.columns:
+        rows = pick('late_arriving', len(df))
+        shift = rng.integers(400, 1001, len(rows)).astype('timedelta64[D]')
+        df.loc[rows, date_column] = df.loc[rows, date_column] - pd.to_timedelta(shift)
+        record('late_arriving', date_column, rows)
+    
+    if amounts:
+        rows = pick('outliers', len(df))
+        column = amounts[0]
+        df.loc[rows, column] = np.round(df.loc[rows, column].to_numpy() * rng.uniform(100, 1000, len(rows)), 2)
+        record('outliers', column, rows)
+    
+    if key_column in df.columns:
+        rows = pick('orphan_keys', len(df))
+        orphans = generate_cpfs(len(rows), rng)
+        if dim_keys is not None:
+            # Regenerate the (unlikely) orphans that happen to exist in the dimension
+            taken = np.isin(orphans, np.asarray(dim_keys, dtype=object))
+            while taken.any():
+                orphans[taken] = generate_cpfs(int(taken.sum()), rng)
+                taken = np.isin(orphans, np.asarray(dim_keys, dtype=object))
+        df[key_column] = df[key_column].astype(object)
+        df.loc[rows, key_column] = orphans
+        record('orphan_keys', key_column, rows)
+        
+        rows = np.setdiff1d(pick('malformed_cpf', len(df)), rows)
+        df.loc[rows, key_column] = _malform(df.loc[rows, key_column].to_numpy(), rng)
+        record('malformed_cpf', key_column, rows)
+    
+    if 'CEP' in df.columns:
+        rows = pick('malformed_cep', len(df))
+        df['CEP'] = df['CEP'].astype(object)
+        df.loc[rows, 'CEP'] = _malform(df.loc[rows, 'CEP'].to_numpy(), rng)
+        record('malformed_cep', 'CEP', rows)
+    
+    if texts:
+        rows = pick('encoding', len(df))
+        columns = np.asarray(texts, dtype=object)[rng.integers(0, len(texts), len(rows))]
+        glitched_rows, glitched_columns = [], []
+        for column in texts:
+            selected = rows[columns == column]
+            selected = selected[df.loc[selected, column].notna().to_numpy()]
+            if not len(selected):
+                continue
+            df[column] = df[column].astype(object)
+            text = df.loc[selected, column].astype(str).to_numpy().astype(str)
+            garbled = np.char.decode(np.char.encode(text, 'utf-8'), 'latin-1')
+            # Plain ASCII survives the round trip, so mark it with a replacement character instead
+            garbled = np.where(garbled == text, np.char.add(text, '\ufffd'), garbled)
+            df.loc[selected, column] = garbled.astype(object)
+            glitched_rows.append(selected)
+            glitched_columns.extend([column] * len(selected))
+        if glitched_rows:
+            glitched_rows = np.concatenate(glitched_rows)
+            order = np.argsort(glitched_rows)
+            record('encoding', None, glitched_rows[order], columns=np.asarray(glitched_columns)[order].tolist())
+    
+    # Duplicates last, so the copies carry the other anomalies of their source rows
+    rows = pick('duplicates', len(df))
+    if len(rows):
+        df = pd.concat([df, df.iloc[rows]], ignore_index=True)
+        record('duplicates', None, np.arange(len(df) - len(rows), len(df)), source_rows=rows.tolist())
+    
+    manifest['rows_after'] = len(df)
+    return df, manifest
+
+def save_manifest(manifest: Dict[str, Any], path: str) -> None:
+    """Save an anomaly manifest as a JSON sidecar"""
+    _replace_path(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+###############################
+# Seekable Generation
+###############################
+
+# Fact rows are generated in fixed-size blocks, each seeded independently
+# from (seed, block number), so any row range can be produced on its own.
+# The block size is part of the row addressing: changing it changes the rows.
+ROW_BLOCK_SIZE = 10000
+
+def seed_block(seed: int, block: int) -> None:
+    """
+    Seed the shared state for one row block from a counter-based generator
+    
+    A Philox generator keyed by (block, seed) drives the vectorized columns
+    and also seeds the random and Faker state, so a block never depends on
+    the blocks before it.
+    """
+    global np_rng
+    np_rng = np.random.Generator(np.random.Philox(key=(block << 64) | (seed & 0xFFFFFFFFFFFFFFFF)))
+    block_seed = int(np_rng.integers(0, 2 ** 63))
+    random.seed(block_seed)
+    fake.seed_instance(block_seed)
+
+def dimension_arrays(business_case: str, dim_df: Table) -> Dict[str, np.ndarray]:
+    """
+    The dimension columns generate_facts reads (DIM_COLUMNS), as NumPy arrays
+    
+    generate_facts accepts the result in place of the dimension table, so
+    callers generating many blocks convert a large dimension once instead of
+    once per block. Text comes out as object arrays of str.
+    """
+    if isinstance(dim_df, dict):
+        return dim_df
+    columns = GENERATORS[business_case.lower()].DIM_COLUMNS
+    if not isinstance(dim_df, pd.DataFrame):
+        dim_df = to_pandas(dim_df.select(columns))
+    return {
+        name: dim_df[name].to_numpy() if dim_df[name].dtype.kind in 'iuf' else dim_df[name].to_numpy(dtype=object)
+        for name in columns
+    }
+
+def generate_block(business_case: str, dim_df: Table, block: int, seed: int,
+                   block_size: int = ROW_BLOCK_SIZE, backend: str = 'pandas') -> Table:
+    """Generate fact rows [block * block_size, (block + 1) * block_size)"""
+    seed_block(seed, block)
+    df = GENERATORS[business_case.lower()].generate_facts(dim_df, block_size, backend)
+    if backend == 'pandas':
+        df.index = pd.RangeIndex(block * block_size, (block + 1) * block_size)
+    return df
+
+def generate_rows(business_case: str, dim_df: Table, start: int, stop: int, seed: int,
+                  reference_time: Optional[datetime] = None, block_size: int = ROW_BLOCK_SIZE,
+                  backend: str = 'pandas') -> Table:
+    """
+    Generate fact rows [start, stop) without generating the rows before them
+    
+    The same (dimension, seed, reference time) always yields the same rows
+    for a given row number, whichever range they are requested in.
+    
+    Parameters:
+    -----------
+    business_case : str
+        The business case to generate data for
+    dim_df : Table
+        Dimension table (generate it with the same seed for a reproducible
+        pair), or its dimension_arrays
+    start : int
+        First row number
+    stop : int
+        Row number after the last row
+    seed : int
+        Seed of the whole fact table
+    reference_time : datetime, optional
+        'Now' for the generated dates (default: today at midnight, so runs on
+        the same day match; pass a fixed value to match across days)
+    block_size : int
+        Rows per independently seeded block
+    backend : str
+        Table backend (see generate_data)
+        
+    Returns:
+    --------
+    Table
+        Fact rows; pandas frames are indexed by their row numbers
+    """
+    if business_case.lower() not in GENERATORS:
+        raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(GENERATORS.keys())}")
+    if not 0 <= start <= stop:
+        raise ValueError(f"Invalid row range {start}:{stop}")
+    
+    parts = []
+    dim_df = dimension_arrays(business_case, dim_df)
+    with pinned_reference_time(reference_time):
+        for block in range(start // block_size, -(-stop // block_size)):
+            df = generate_block(business_case, dim_df, block, seed, block_size, backend)
+            first = block * block_size
+            parts.append(slice_table(df, max(start, first) - first, min(stop, first + block_size) - first))
+    
+    if not parts:
+        # An empty range still has the table's columns and types: take them from a one-row block
+        with pinned_reference_time(reference_time):
+            return slice_table(generate_block(business_case, dim_df, start // block_size, seed, 1, backend), 0, 0)
+    if backend == 'pandas':
+        # Keep the row numbers as the index
+        return pd.concat(parts)
+    return concat_tables(parts)
+
+def parse_seed(value: str) -> int:
+    """argparse type for seeds: a non-negative integer"""
+    try:
+        seed = int(value)
+    except ValueError:
+        seed = -1
+    if seed < 0:
+        raise argparse.ArgumentTypeError(f"invalid seed '{value}', expected a non-negative integer")
+    return seed
+
+def parse_row_range(value: str) -> Tuple[int, int]:
+    """Parse a START:STOP row range"""
+    try:
+        start, stop = (int(part) for part in value.split(':'))
+    except ValueError:
+        raise ValueError(f"Invalid row range '{value}', expected START:STOP")
+    if not 0 <= start <= stop:
+        raise ValueError(f"Invalid row range '{value}', expected 0 <= START <= STOP")
+    return start, stop
+
+###############################
+# Shared Dimension Tables
+###############################
+
+def _shared_memory_dir() -> Optional[str]:
+    """RAM-backed directory for memory-mapped columns when available"""
+    return '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+class SharedDimension:
+    """
+    Dimension columns published as memory-mapped arrays for worker processes
+    
+    Each column is stored once as a .npy file (in /dev/shm when available)
+    and workers attach to it by name, so the dimension is never pickled per
+    worker. Numeric and datetime columns are stored as-is, low-cardinality
+    strings as category codes and other strings as fixed-width UTF-8 bytes.
+    The small, picklable spec is all a worker needs to attach.
+    """
+    
+    def __init__(self, dim_df: pd.DataFrame, columns: Optional[List[str]] = None, directory: Optional[str] = None):
+        self.directory = tempfile.mkdtemp(prefix='megazord-dim-', dir=directory or _shared_memory_dir())
+        self.spec = {'directory': self.directory, 'rows': len(dim_df), 'columns': {}}
+        
+        for name in columns or list(dim_df.columns):
+            self.spec['columns'][name] = self._publish(name, dim_df[name])
+    
+    def _publish(self, name: str, series: pd.Series) -> Dict[str, Any]:
+        """Store one column and return its entry in the spec"""
+        column = {'file': os.path.join(self.directory, f"{len(self.spec['columns'])}.npy"), 'categories': None}
+        
+        if series.dtype.kind in 'biufcmM':
+            values = series.to_numpy()
+        else:
+            strings = series.astype(str)
+            categories = pd.unique(strings)
+            if len(categories) <= max(len(strings) // 2, 1) and len(categories) < 2 ** 31:
+                values = pd.Categorical(strings, categories=categories).codes.astype(np.int32)
+                column['categories'] = list(categories)
+            else:
+                values = np.char.encode(strings.to_numpy(dtype=str), 'utf-8')
+        
+        np.save(column['file'], np.ascontiguousarray(values), allow_pickle=False)
+        return column
+    
+    @staticmethod
+    def attach(spec: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Map the stored columns read-only without copying them"""
+        return {
+            name: np.load(column['file'], mmap_mode='r', allow_pickle=False)
+            for name, column in spec['columns'].items()
+        }
+    
+    @staticmethod
+    def to_frame(spec: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Build a DataFrame of the attached columns for generate_facts
+        
+        Numeric columns and category codes stay memory-mapped; fixed-width
+        byte strings are decoded into a copy in the worker.
+        """
+        arrays = SharedDimension.attach(spec)
+        data = {}
+        for name, column in spec['columns'].items():
+            values = arrays[name]
+            if column['categories'] is not None:
+                data[name] = pd.Categorical.from_codes(values, categories=column['categories'])
+            elif values.dtype.kind == 'S':
+                data[name] = np.char.decode(values, 'utf-8')
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False)
+    
+    def close(self) -> None:
+        """Remove the stored columns"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def __enter__(self) -> 'SharedDimension':
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+# Dimension columns attached in this worker process (see dimension_arrays), by
+# directory; only the current one is kept, so long-lived workers don't
+# accumulate dimensions
+_attached_dimensions: Dict[str, Dict[str, np.ndarray]] = {}
+
+def _parallel_facts_worker(business_case: str, spec: Dict[str, Any], start: int, stop: int,
+                           seed: Optional[int], reference_time: Optional[datetime], backend: str) -> Table:
+    """Generate fact rows [start, stop) against a shared dimension"""
+    dim_df = _attached_dimensions.get(spec['directory'])
+    if dim_df is None:
+        _attached_dimensions.clear()
+        dim_df = _attached_dimensions[spec['directory']] = dimension_arrays(business_case,
+                                                                            SharedDimension.to_frame(spec))
+    
+    if seed is not None:
+        return generate_rows(business_case, dim_df, start, stop, seed, reference_time, backend=backend)
+    set_seed(None)
+    return GENERATORS[business_case].generate_facts(dim_df, stop - start, backend)
+
+def generate_facts_parallel(business_case: str, dim_df: Table, num_rows: int,
+                            workers: Optional[int] = None, seed: Optional[int] = None,
+                            chunk_rows: Optional[int] = None,
+                            reference_time: Optional[datetime] = None, backend: str = 'pandas',
+                            first_row: int = 0) -> Table:
+    """
+    Generate a fact table on a process pool against a shared dimension
+    
+    Only the dimension columns listed in the generator's DIM_COLUMNS are
+    shared, and each worker attaches to them once.
+    
+    Parameters:
+    -----------
+    business_case : str
+        The business case to generate data for
+    dim_df : Table
+        Dimension table
+    num_rows : int
+        Number of fact rows to generate
+    workers : int, optional
+        Number of worker processes (default: CPU count)
+    seed : int, optional
+        Seed for reproducible output; rows match generate_rows with the same
+        seed, however the work is split
+    chunk_rows : int, optional
+        Rows per task (default: num_rows split evenly across four tasks per
+        worker, rounded up to whole row blocks when seeded)
+    reference_time : datetime, optional
+        'Now' for the generated dates when seeded (see generate_rows)
+    backend : str
+        Table backend the workers build and return (see generate_data)
+    first_row : int
+        When seeded, generate rows [first_row, first_row + num_rows) of the
+        seeded fact table (see generate_rows)
+        
+    Returns:
+    --------
+    Table
+        Fact table
+    """
+    business_case = business_case.lower()
+    if business_case not in GENERATORS:
+        raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(GENERATORS.keys())}")
+    
+    generator = GENERATORS[business_case]
+    workers = workers or os.cpu_count() or 1
+    chunk_rows = chunk_rows or max(-(-num_rows // (workers * 4)), 1)
+    if seed is not None:
+        # Whole blocks per task, so no block is generated twice
+        chunk_rows = -(-chunk_rows // ROW_BLOCK_SIZE) * ROW_BLOCK_SIZE
+    
+    with SharedDimension(to_pandas(dim_df), generator.DIM_COLUMNS) as shared, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                                mp_context=process_context(backend)) as executor:
+        stop = first_row + num_rows if seed is not None else num_rows
+        futures = [
+            executor.submit(_parallel_facts_worker, business_case, shared.spec,
+                            start, min(start + chunk_rows, stop), seed, reference_time, backend)
+            for start in range(stop - num_rows, stop, chunk_rows)
+        ]
+        parts = [future.result() for future in futures]
+    
+    if not parts:
+        # Empty, with the columns and types of a non-empty table
+        if seed is not None:
+            return generate_rows(business_case, dim_df, first_row, first_row, seed, reference_time, backend=backend)
+        return slice_table(generator.generate_facts(dim_df, 1, backend), 0, 0)
+    return concat_tables(parts)
+
+###############################
+# Sharded Generation
+###############################
+
+def shard_range(num_rows: int, shard: int, num_shards: int, block_size: int = ROW_BLOCK_SIZE) -> Tuple[int, int]:
+    """
+    Fact rows [start, stop) owned by one shard
+    
+    Shards own contiguous runs of whole row blocks, so together they cover
+    [0, num_rows) exactly once and no block is generated by two shards:
+    every start is a multiple of block_size, and only the last non-empty
+    shard's stop is clipped to num_rows. Shards beyond the number of blocks
+    are empty. (Alignment is about not repeating work; seeded
+    rows don't depend on the range they are generated in, see generate_rows.)
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"Invalid shard {shard} of {num_shards}, expected 0 <= shard < num_shards")
+    blocks = -(-num_rows // block_size)
+    
+    # The first blocks % num_shards shards take one extra block, so with fewer
+    # blocks than shards the empty shards are the trailing ones
+    base, extra = divmod(blocks, num_shards)
+    start = shard * base + min(shard, extra)
+    stop = start + base + (shard < extra)
+    return min(start * block_size, num_rows), min(stop * block_size, num_rows)
+
+def shard_suffix(shard: int, num_shards: int) -> str:
+    """Fact file suffix of a shard, e.g. '.shard-00001-of-00008'"""
+    return f".shard-{shard:05d}-of-{num_shards:05d}"
+
+def generate_range(business_case: str, num_dim_rows: int, start: int, stop: int, seed: int,
+                   reference_time: Optional[datetime] = None, backend: str = 'pandas',
+                   fact_workers: Optional[int] = None, dim_from: Optional[str] = None) -> Tuple[Table, Table]:
+    """
+    The seeded dimension and fact rows [start, stop) of the seeded fact table
+    
+    The dimension is the one generate_data builds with the same seed, so any
+    process can rebuild it instead of receiving it, or is loaded from
+    dim_from (see load_dimension).
+    """
+    set_seed(seed)
+    if dim_from:
+        dim_df = load_dimension(dim_from, business_case, backend)
+    else:
+        print(f"Generating {num_dim_rows} dimension rows for {business_case}...")
+        with pinned_reference_time(reference_time):
+            dim_df = GENERATORS[business_case].generate_dimension(num_dim_rows, backend)
+    
+    print(f"Generating fact rows {start}:{stop} for {business_case}...")
+    if fact_workers and fact_workers > 1:
+        fact_df = generate_facts_parallel(business_case, dim_df, stop - start, workers=fact_workers, seed=seed,
+                                          reference_time=reference_time, backend=backend, first_row=start)
+    else:
+        fact_df = generate_rows(business_case, dim_df, start, stop, seed, reference_time, backend=backend)
+    return dim_df, fact_df
+
+def generate_shard(business_case: str, shard: int, num_shards: int, num_dim_rows: int = NUM_ROWS_DIM,
+                   num_fact_rows: int = NUM_ROWS_FACT, seed: int = 0, reference_time: Optional[datetime] = None,
+                   backend: str = 'pandas', fact_workers: Optional[int] = None,
+                   dim_from: Optional[str] = None) -> Tuple[Table, Table, Tuple[int, int]]:
+    """
+    Generate one shard of a seeded dataset, independently of the other shards
+    
+    Every shard rebuilds the same dimension and generates only its own fact
+    rows (see shard_range); concatenating the shards in order gives exactly
+    the fact table generate_data builds with the same seed and reference time.
+    Fact IDs come from per-block seeded streams, so they are unique across
+    shards as well.
+    
+    Parameters:
+    -----------
+    business_case : str
+        The business case to generate data for
+    shard : int
+        This shard's number, from 0 to num_shards - 1
+    num_shards : int
+        Total number of shards
+    num_dim_rows : int
+        Number of dimension rows
+    num_fact_rows : int
+        Number of fact rows of the whole dataset
+    seed : int
+        Seed of the whole dataset (the same on every shard)
+    reference_time : datetime, optional
+        'Now' for the generated dates (pass the same value on every shard when
+        they may run on different days)
+    backend : str
+        Table backend (see generate_data)
+    fact_workers : int, optional
+        Worker processes for this shard's fact rows
+    dim_from : str, optional
+        Load the dimension from this file instead of rebuilding it (see
+        load_dimension)
+        
+    Returns:
+    --------
+    tuple
+        (dimension_df, fact_df, (start, stop))
+    """
+    business_case = business_case.lower()
+    if business_case not in GENERATORS:
+        raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(GENERATORS.keys())}")
+    start, stop = shard_range(num_fact_rows, shard, num_shards)
+    dim_df, fact_df = generate_range(business_case, num_dim_rows, start, stop, seed, reference_time, backend,
+                                     fact_workers, dim_from)
+    return dim_df, fact_df, (start, stop)
+
+def save_shard_manifest(output_dir: str, business_case: str, shard: int, num_shards: int,
+                        params: Dict[str, Any], rows: Tuple[int, int], paths: List[str]) -> str:
+    """Describe one shard's files next to them, for merge_shards; returns the manifest path"""
+    manifest = {
+        'business_case': business_case,
+        'shard': shard,
+        'num_shards': num_shards,
+        'params': params,
+        'version': source_version(),
+        'rows': list(rows),
+        'files': [{'file': os.path.basename(path), 'bytes': os.path.getsize(path)} for path in paths]
+    }
+    path = os.path.join(output_dir, f"{business_case}_facts{shard_suffix(shard, num_shards)}.json")
+    save_manifest(manifest, path)
+    return path
+
+def merge_shards(output_dir: str, business_case: str) -> Dict[str, Any]:
+    """
+    Combine the shard manifests of a dataset into '{case}_facts.manifest.json'
+    
+    Checks that every shard is present, that all shards were generated with
+    the same parameters and generator version, and that their row ranges
+    cover the fact table exactly once. Files are not rewritten: the merged
+    manifest lists the dimension and the fact files in row order.
+    """
+    business_case = business_case.lower()
+    pattern = re.compile(rf"{re.escape(business_case)}_facts\.shard-(\d+)-of-(\d+)\.json$")
+    shards = []
+    for name in sorted(os.listdir(output_dir)):
+        if pattern.fullmatch(name):
+            with open(os.path.join(output_dir, name), encoding='utf-8') as f:
+                shards.append(json.load(f))
+    if not shards:
+        raise ValueError(f"No shard manifests for '{business_case}' in {output_dir}")
+    
+    first = shards[0]
+    num_shards = first['num_shards']
+    for manifest in shards:
+        if (manifest['num_shards'], manifest['params'], manifest['version']) != (num_shards, first['params'], first['version']):
+            raise ValueError(f"Shard {manifest['shard']} was generated with different parameters or generator version")
+    missing = sorted(set(range(num_shards)) - {manifest['shard'] for manifest in shards})
+    if missing:
+        raise ValueError(f"Missing shards: {', '.join(str(shard) for shard in missing)} of {num_shards}")
+    
+    shards.sort(key=lambda manifest: manifest['shard'])
+    expected = 0
+    for manifest in shards:
+        if manifest['rows'][0] != expected:
+            raise ValueError(f"Shard {manifest['shard']} starts at row {manifest['rows'][0]}, expected {expected}")
+        expected = manifest['rows'][1]
+    if expected != first['params']['fact_rows']:
+        raise ValueError(f"Shards cover {expected} fact rows, expected {first['params']['fact_rows']}")
+    
+    files = [entry for manifest in shards for entry in manifest['files']]
+    dimension = [entry for entry in files if '_dimension' in entry['file']]
+    merged = {
+        'business_case': business_case,
+        'num_shards': num_shards,
+        'params': first['params'],
+        'version': first['version'],
+        'fact_rows': expected,
+        'dimension': dimension[0] if dimension else None,
+        'facts': [
+            {'shard': manifest['shard'], 'rows': manifest['rows'], **entry}
+            for manifest in shards for entry in manifest['files'] if '_facts' in entry['file']
+        ]
+    }
+    save_manifest(merged, os.path.join(output_dir, f"{business_case}_facts.manifest.json"))
+    return merged
+
+###############################
+# Sample Profiles
+###############################
+
+# Limits that keep a column profile small regardless of the input size
+PROFILE_MAX_CATEGORIES = 1000
+PROFILE_SAMPLE_SIZE = 10000
+PROFILE_TEXT_VALUES = 1000
+PROFILE_QUANTILES = 201
+
+PROFILE_MIN_DOMAIN_COUNT = 5
+
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$')
+
+# Formats of high-cardinality text columns that are regenerated as such
+_TEXT_FORMATS = {
+    'cpf': re.compile(r'^\d{3}\.\d{3}\.\d{3}-\d{2}$'),
+    'uuid': re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'),
+    'email': re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+}
+
+# Characters drawn for each character class of a text shape
+_SHAPE_ALPHABETS = {
+    '9': np.array(list('0123456789')),
+    'a': np.array(list('abcdefghijklmnopqrstuvwxyz')),
+    'A': np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+}
+
+def text_shape(value: str) -> str:
+    """Character classes of a text value: digits as '9', letters as 'a'/'A', anything else kept"""
+    return ''.join('9' if char.isdigit() else ('A' if char.isupper() else 'a') if char.isalpha() else char
+                   for char in value)
+
+def _shape_weights(values: List[str]) -> Tuple[List[str], List[float]]:
+    """The most common shapes of some values with their frequencies"""
+    counts = pd.Series([text_shape(value) for value in values]).value_counts().head(PROFILE_TEXT_VALUES)
+    return counts.index.tolist(), (counts / counts.sum()).round(8).tolist()
+
+def text_format(values: List[str]) -> str:
+    """'cpf', 'uuid' or 'email' when every value has that format, else 'shape'"""
+    for name, pattern in _TEXT_FORMATS.items():
+        if values and all(pattern.match(value) for value in values):
+            return name
+    return 'shape'
+
+def text_profile(values: List[str]) -> Dict[str, Any]:
+    """
+    Profile high-cardinality text by format and shape, without its values
+    
+    CPFs and UUIDs are recognized and regenerated as fresh values. Anything
+    else keeps only its shapes (see text_shape) and their frequencies; for
+    e-mail addresses that is the local part's shape, plus the domains seen
+    at least PROFILE_MIN_DOMAIN_COUNT times.
+    """
+    profile = {'format': text_format(values)}
+    if profile['format'] == 'email':
+        local_parts, domains = zip(*(value.rsplit('@', 1) for value in values))
+        domains = pd.Series(domains).value_counts()
+        domains = domains[domains >= PROFILE_MIN_DOMAIN_COUNT]
+        profile['domains'] = domains.index.tolist() or ['example.com']
+        profile['domain_weights'] = (domains / domains.sum()).round(8).tolist() or [1.0]
+        values = list(local_parts)
+    if profile['format'] in ('shape', 'email'):
+        profile['shapes'], profile['shape_weights'] = _shape_weights(values)
+    return profile
+
+def _fill_shapes(shapes: List[str], weights: List[float], num_rows: int) -> np.ndarray:
+    """Random values following the given shapes, one shape drawn per row"""
+    weights = np.asarray(weights, dtype=np.float64)
+    codes = np_rng.choice(len(shapes), size=num_rows, p=weights / weights.sum())
+    values = np.full(num_rows, '', dtype=object)
+    for code in np.unique(codes):
+        shape = np.array(list(shapes[code]))
+        if not len(shape):
+            continue
+        rows = np.flatnonzero(codes == code)
+        chars = np.tile(shape, (len(rows), 1))
+        for char_class, alphabet in _SHAPE_ALPHABETS.items():
+            positions = np.flatnonzero(shape == char_class)
+            chars[:, positions] = alphabet[np_rng.integers(0, len(alphabet), (len(rows), len(positions)))]
+        values[rows] = np.ascontiguousarray(chars).view(f'<U{len(shape)}').ravel().astype(object)
+    return values
+
+def _random_uuids(num_rows: int) -> np.ndarray:
+    """Version 4 UUID strings built from np_rng bytes"""
+    raw = np_rng.integers(0, 256, (num_rows, 16), dtype=np.uint8)
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x40
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80
+    digits = np.array(list('0123456789abcdef'))
+    chars = np.empty((num_rows, 32), dtype='<U1')
+    chars[:, 0::2], chars[:, 1::2] = digits[raw >> 4], digits[raw & 0x0F]
+    chars = np.insert(chars, [8, 12, 16, 20], '-', axis=1)
+    return np.ascontiguousarray(chars).view('<U36').ravel().astype(object)
+
+def _sample_text(column: Dict[str, Any], num_rows: int) -> np.ndarray:
+    """Draw a text column from its format and shapes (see text_profile)"""
+    if column['format'] == 'cpf':
+        return generate_cpfs(num_rows)
+    if column['format'] == 'uuid':
+        return _random_uuids(num_rows)
+    values = _fill_shapes(column['shapes'], column['shape_weights'], num_rows)
+    if column['format'] == 'email':
+        weights = np.asarray(column['domain_weights'], dtype=np.float64)
+        domains = np.asarray(column['domains'], dtype=object)[
+            np_rng.choice(len(weights), size=num_rows, p=weights / weights.sum())
+        ]
+        values = values + '@' + domains
+    return values
+
+def _read_chunks(path: str, chunk_rows: int, columns: Optional[List[str]] = None,
+                 dtype: Optional[Dict[str, Any]] = None):
+    """Yield DataFrame chunks from a CSV (optionally compressed), Parquet or Arrow IPC file"""
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise ImportError("Parquet input requires the 'pyarrow' package (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    elif path.endswith('.arrow'):
+        if pa is None:
+            raise ImportError("Arrow IPC input requires the 'pyarrow' package (pip install pyarrow)")
+        # Memory-mapped: only the requested columns of each batch are touched
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunk_rows):
+                    yield batch.slice(start, chunk_rows).to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, usecols=columns, dtype=dtype)
+
+def _file_columns(path: str) -> List[str]:
+    """Column names of a CSV, Parquet or Arrow IPC file, without reading its rows"""
+    if path.endswith('.parquet'):
+        return pq.ParquetFile(path).schema_arrow.names
+    if path.endswith('.arrow'):
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+class _ColumnProfiler:
+    """Streaming accumulator for one column: counts, nulls and a bounded sample"""
+    
+    def __init__(self, name: str, sample_size: int, max_categories: int, keep_text_values: bool = False):
+        self.name = name
+        self.keep_text_values = keep_text_values
+        self.kind = None
+        self.rows = 0
+        self.nulls = 0
+        self.sample_size = sample_size
+        self.max_categories = max_categories
+        self.counts = pd.Series(dtype='int64')
+        self.sample = None
+        self.sample_keys = np.empty(0)
+    
+    def _detect_kind(self, values: pd.Series) -> str:
+        if values.dtype.kind == 'b':
+            return 'boolean'
+        if values.dtype.kind in 'iu':
+            return 'integer'
+        if values.dtype.kind == 'f':
+            return 'integer' if np.all(np.mod(values, 1) == 0) else 'float'
+        if values.dtype.kind == 'M':
+            return 'datetime'
+        head = values.astype(str).head(100)
+        if len(head) and head.str.match(_DATE_PATTERN).all():
+            return 'datetime'
+        return 'categorical'
+    
+    def update(self, series: pd.Series) -> None:
+        self.rows += len(series)
+        values = series.dropna()
+        self.nulls += len(series) - len(values)
+        if values.empty:
+            return
+        
+        if self.kind is None:
+            self.kind = self._detect_kind(values)
+        elif self.kind == 'integer' and values.dtype.kind == 'f' and not np.all(np.mod(values, 1) == 0):
+            self.kind = 'float'
+        
+        if self.kind == 'datetime':
+            values = pd.to_datetime(values, errors='coerce').dropna()
+        elif self.kind == 'categorical':
+            values = values.astype(str)
+        
+        # Exact frequencies while the number of distinct values stays small
+        if self.counts is not None:
+            self.counts = self.counts.add(values.value_counts(), fill_value=0)
+            if len(self.counts) > self.max_categories:
+                self.counts = None
+        
+        # Bounded uniform sample: keep the values with the smallest random keys
+        keys = np_rng.random(len(values))
+        chunk = values.to_numpy()
+        if self.sample is not None:
+            keys = np.concatenate([self.sample_keys, keys])
+            chunk = np.concatenate([self.sample, chunk])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, chunk = keys[keep], chunk[keep]
+        self.sample_keys, self.sample = keys, chunk
+    
+    def finish(self) -> Dict[str, Any]:
+        profile = {
+            'name': self.name,
+            'kind': self.kind or 'categorical',
+            'null_rate': self.nulls / self.rows if self.rows else 0.0
+        }
+        if self.sample is None:
+            profile.update(values=[], weights=[])
+            return profile
+        
+        # Identifiers (CPFs, UUIDs, e-mails) and mostly distinct text are
+        # profiled by shape below, so source values don't end up in the spec
+        if profile['kind'] == 'categorical' and self.counts is not None and not self.keep_text_values:
+            distinct = len(self.counts) > max(50, (self.rows - self.nulls) // 2)
+            if distinct or text_format([str(value) for value in self.sample]) != 'shape':
+                self.counts = None
+        
+        # Few distinct values (or any categorical column) are sampled from exact frequencies
+        if self.counts is not None and (profile['kind'] in ('categorical', 'boolean') or len(self.counts) <= 50):
+            values = self.counts.index
+            if profile['kind'] == 'datetime':
+                values = pd.DatetimeIndex(values).strftime('%Y-%m-%d %H:%M:%S')
+            profile['values'] = [value.item() if hasattr(value, 'item') else value for value in values]
+            profile['weights'] = (self.counts / self.counts.sum()).round(8).tolist()
+            return profile
+        
+        if profile['kind'] == 'categorical':
+            # High-cardinality text (names, IDs)
+            profile['kind'] = 'text'
+            if self.keep_text_values:
+                profile['values'] = [str(value) for value in self.sample[:PROFILE_TEXT_VALUES]]
+            else:
+                profile.update(text_profile([str(value) for value in self.sample]))
+            return profile
+        
+        probabilities = np.linspace(0, 1, PROFILE_QUANTILES)
+        if profile['kind'] == 'datetime':
+            numbers = self.sample.astype('datetime64[ns]').astype(np.int64)
+            profile['date_only'] = bool(np.all(numbers % (86400 * 10 ** 9) == 0))
+            profile['quantiles'] = [
+                str(value) for value in np.quantile(numbers, probabilities).astype('datetime64[ns]').astype('datetime64[s]')
+            ]
+        else:
+            numbers = self.sample.astype(np.float64)
+            # Relative to each value, so large amounts keep their cents (rounding is off by at most an ulp)
+            profile['decimals'] = next(
+                (d for d in range(7) if np.allclose(np.round(numbers, d), numbers, rtol=1e-12, atol=0)), 6
+            )
+            profile['quantiles'] = np.quantile(numbers, probabilities).tolist()
+        return profile
+
+def profile_file(path: str, chunk_rows: int = CSV_CHUNK_ROWS, sample_size: int = PROFILE_SAMPLE_SIZE,
+                 max_categories: int = PROFILE_MAX_CATEGORIES, keep_text_values: bool = False) -> Dict[str, Any]:
+    """
+    Build a compact per-column profile of a CSV or Parquet file in streaming chunks
+    
+    Parameters:
+    -----------
+    path : str
+        CSV (optionally .gz/.zst) or .parquet file to profile
+    chunk_rows : int
+        Rows read per chunk
+    sample_size : int
+        Values kept per column to estimate quantiles
+    max_categories : int
+        Distinct values above which exact frequencies are dropped
+    keep_text_values : bool
+        Store up to PROFILE_TEXT_VALUES raw values of high-cardinality text
+        columns for resampling, instead of their format and shapes (the spec
+        then contains source data)
+        
+    Returns:
+    --------
+    Dict[str, Any]
+        Profile spec (JSON-serializable) for generate_from_profile
+    """
+    profilers = None
+    for chunk in _read_chunks(path, chunk_rows):
+        if profilers is None:
+            profilers = [_ColumnProfiler(name, sample_size, max_categories, keep_text_values) for name in chunk.columns]
+        for profiler in profilers:
+            profiler.update(chunk[profiler.name])
+    
+    profilers = profilers or []
+    return {
+        'source': os.path.basename(path),
+        'rows': profilers[0].rows if profilers else 0,
+        'columns': [profiler.finish() for profiler in profilers]
+    }
+
+def save_profile(profile: Dict[str, Any], path: str) -> None:
+    """Save a profile spec as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+
+def load_profile(path: str) -> Dict[str, Any]:
+    """Load a profile spec saved by save_profile"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def _sample_column(column: Dict[str, Any], num_rows: int) -> Any:
+    """Draw one column from its profile with vectorized sampling"""
+    kind = column['kind']
+    if 'weights' in column:
+        if not column['values']:
+            return pd.Series([None] * num_rows, dtype=object)
+        weights = np.asarray(column['weights'], dtype=np.float64)
+        values = np.asarray(column['values'])[np_rng.choice(len(weights), size=num_rows, p=weights / weights.sum())]
+    elif kind == 'text' and 'values' not in column:
+        values = _sample_text(column, num_rows)
+    elif kind == 'text':
+        values = np.asarray(column['values'], dtype=object)[np_rng.integers(0, len(column['values']), num_rows)]
+    else:
+        # Inverse-CDF sampling by interpolating between the stored quantiles
+        probabilities = np.linspace(0, 1, len(column['quantiles']))
+        if kind == 'datetime':
+            quantiles = np.asarray(column['quantiles'], dtype='datetime64[s]').astype(np.int64)
+            values = np.interp(np_rng.random(num_rows), probabilities, quantiles).astype(np.int64)
+            unit = 'D' if column.get('date_only') else 's'
+            values = (values // 86400 if unit == 'D' else values).astype(f'datetime64[{unit}]')
+        else:
+            values = np.round(np.interp(np_rng.random(num_rows), probabilities, column['quantiles']), column['decimals'])
+    
+    if kind == 'integer':
+        values = values.astype(np.int64)
+    elif kind == 'float':
+        values = values.astype(np.float64)
+    elif kind == 'boolean':
+        values = values.astype(bool)
+    elif kind == 'datetime':
+        values = pd.to_datetime(values)
+    
+    if column['null_rate'] <= 0:
+        return values
+    mask = np_rng.random(num_rows) < column['null_rate']
+    if kind == 'integer':
+        return pd.arrays.IntegerArray(values, mask)
+    if kind == 'float':
+        return pd.arrays.FloatingArray(values, mask)
+    if kind == 'boolean':
+        return pd.arrays.BooleanArray(values, mask)
+    series = pd.Series(values)
+    return series.mask(mask)
+
+def generate_from_profile(profile: Dict[str, Any], num_rows: int, seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Generate rows shaped like the profiled file
+    
+    Parameters:
+    -----------
+    profile : Dict[str, Any]
+        Spec returned by profile_file or load_profile
+    num_rows : int
+        Number of rows to generate
+    seed : int, optional
+        Seed for reproducible output
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Generated table with the profiled columns, in their original order
+    """
+    if seed is not None:
+        set_seed(seed)
+    return pd.DataFrame({column['name']: _sample_column(column, num_rows) for column in profile['columns']})
+
+###############################
+# Validation
+###############################
+
+# Rows read per chunk when validating (bytes per block for CSV read with pyarrow),
+# and the dimension columns generated unique
+VALIDATE_CHUNK_ROWS = 1000000
+VALIDATE_BLOCK_BYTES = 64 * 1024 * 1024
+UNIQUE_DIM_COLUMNS = ['CPF', 'Nome', 'Email', 'Telefone']
+
+_CPF_PATTERN = r'[0-9]{3}\.[0-9]{3}\.[0-9]{3}-[0-9]{2}'
+
+def valid_cpfs(values: pd.Series) -> np.ndarray:
+    """Whether each value is a formatted CPF (XXX.XXX.XXX-XX) with correct check digits"""
+    formatted = values.str.fullmatch(_CPF_PATTERN).fillna(False).to_numpy(dtype=bool)
+    chars = values[formatted].to_numpy().astype('S14').view(np.uint8).reshape(-1, 14)
+    digits = chars[:, [0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13]].astype(np.int64) - ord('0')
+    
+    valid = np.zeros(len(values), dtype=bool)
+    valid[formatted] = (cpf_check_digits(digits[:, :9]) == digits[:, 9:]).all(axis=1)
+    return valid
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """64-bit hashes of a column's values, for set membership and duplicate counts"""
+    return pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy()
+
+def _read_columns(path: str, chunk_rows: int, columns: List[str], numeric_columns: List[str]):
+    """
+    Yield chunks of only the given columns, as text except numeric_columns
+    
+    CSV files are parsed with pyarrow's multithreaded streaming reader when
+    it is installed; dates stay text so a malformed value is counted by the
+    checks instead of failing the read.
+    """
+    if pa_csv is None or not re.search(r'\.csv(\.gz|\.zst)?$', path):
+        yield from _read_chunks(path, chunk_rows, columns,
+                                dtype={column: str for column in columns if column not in numeric_columns})
+        return
+    
+    types = {column: pa.float64() if column in numeric_columns else pa.string() for column in columns}
+    reader = pa_csv.open_csv(pa.input_stream(path, compression='detect'),
+                             read_options=pa_csv.ReadOptions(block_size=VALIDATE_BLOCK_BYTES),
+                             convert_options=pa_csv.ConvertOptions(include_columns=columns, column_types=types,
+                                                                   strings_can_be_null=True))
+    for batch in reader:
+        yield batch.to_pandas()
+
+def _count_duplicates(hashes: List[np.ndarray]) -> int:
+    """Rows whose value already appeared earlier, from the hashes of all chunks"""
+    hashes = np.sort(np.concatenate(hashes)) if hashes else np.empty(0, dtype=np.uint64)
+    return int((hashes[1:] == hashes[:-1]).sum())
+
+def output_files(directory: str, business_case: str, table: str) -> List[str]:
+    """
+    Files written by save_data for one table, in any supported format
+    
+    The dimension is '{case}_dimension.{ext}'; fact tables may carry a suffix
+    (e.g. '.rows-0-1000'), and every matching fact file is returned.
+    """
+    suffix = r'(\.[^/]+)?' if table == 'facts' else ''
+    pattern = re.compile(rf"{re.escape(business_case)}_{table}{suffix}\.(csv(\.gz|\.zst)?|parquet|arrow)$")
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if pattern.fullmatch(name))
+
+class _CheckResults:
+    """Row and failure counts of each (table, check, column), in the order first seen"""
+    
+    def __init__(self):
+        self.checks: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    
+    def add(self, table: str, check: str, column: str, rows: int, failures: int) -> Dict[str, Any]:
+        entry = self.checks.setdefault((table, check, column), {
+            'table': table, 'check': check, 'column': column, 'rows': 0, 'failures': 0
+        })
+        entry['rows'] += rows
+        entry['failures'] += int(failures)
+        return entry
+    
+    def finish(self) -> List[Dict[str, Any]]:
+        for entry in self.checks.values():
+            entry['passed'] = entry['failures'] == 0 and entry.get('passed', True)
+        return list(self.checks.values())
+
+def _check_dates(results: _CheckResults, values: pd.Series, column: str, window: Tuple[int, int],
+                 reference: Optional[datetime]) -> None:
+    """Count unparseable dates and, with a reference time, dates outside the window"""
+    present = values.notna()
+    dates = pd.to_datetime(values, format='ISO8601', errors='coerce') if values.dtype.kind != 'M' else values
+    failures = int((present & dates.isna()).sum())
+    
+    if reference is not None:
+        low = pd.Timestamp(reference).normalize() + pd.Timedelta(days=window[0])
+        high = pd.Timestamp(reference) + pd.Timedelta(days=window[1])
+        failures += int(((dates < low) | (dates > high)).sum())
+    
+    entry = results.add('facts', 'date_window', column, int(present.sum()), failures)
+    if dates.notna().any():
+        entry['min'] = min(entry.get('min', dates.max()), dates.min())
+        entry['max'] = max(entry.get('max', dates.min()), dates.max())
+
+def _finish_date_checks(results: _CheckResults, generator: Any, reference: Optional[datetime]) -> None:
+    """
+    Without a reference time, check that each date column spans no more than
+    its window and does not end after now plus the window end
+    """
+    for (table, check, column), entry in results.checks.items():
+        if check == 'date_window' and 'min' in entry:
+            start_days, end_days = generator.FACT_DATES[column]
+            if reference is None:
+                entry['passed'] = bool(
+                    entry['max'] - entry['min'] <= pd.Timedelta(days=end_days - start_days + 1)
+                    and entry['max'] <= pd.Timestamp.now() + pd.Timedelta(days=end_days))
+            entry['min'], entry['max'] = entry['min'].isoformat(), entry['max'].isoformat()
+
+def validate_files(business_case: str, directory: str = 'data', chunk_rows: int = VALIDATE_CHUNK_ROWS,
+                   reference_time: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Check the invariants of a saved dataset, streaming its files in chunks
+    
+    Only the checked columns are read, each check is vectorized per chunk,
+    and keys are compared as 64-bit hashes (sorted arrays rather than Python
+    sets), so memory grows by 8 bytes per fact row for the duplicate check.
+    
+    Checks:
+    - CPF check digits of the dimension CPFs and of the fact key
+    - every fact key is present in the dimension
+    - no duplicate fact IDs (across all fact files) or dimension CPF, name, e-mail and phone
+    - fact dates within the generator's windows (see _finish_date_checks without a reference time)
+    - numeric fact columns within the generator's ranges
+    
+    Parameters:
+    -----------
+    business_case : str
+        The business case the files were generated for
+    directory : str
+        Directory holding the files written by save_data
+    chunk_rows : int
+        Rows read per chunk
+    reference_time : datetime, optional
+        'Now' the data was generated against (as passed to generate_data);
+        enables the exact per-row date window check
+        
+    Returns:
+    --------
+    Dict[str, Any]
+        Report with per-table throughput, per-check counts and an overall 'passed'
+    """
+    business_case = business_case.lower()
+    if business_case not in GENERATORS:
+        raise ValueError(f"Business case '{business_case}' not supported. Available options: {', '.join(GENERATORS.keys())}")
+    generator = GENERATORS[business_case]
+    
+    dim_paths = output_files(directory, business_case, 'dimension')
+    fact_paths = output_files(directory, business_case, 'facts')
+    if len(dim_paths) != 1 or not fact_paths:
+        raise ValueError(f"Expected one dimension file and at least one fact file for '{business_case}' in {directory}")
+    
+    results = _CheckResults()
+    tables = {}
+    
+    def stream(table: str, paths: List[str], wanted: List[str], numeric_columns: List[str]):
+        """Yield chunks of the wanted columns while timing the table"""
+        start = time.perf_counter()
+        rows = 0
+        for path in paths:
+            available = set(_file_columns(path))
+            columns = [column for column in wanted if column in available]
+            for chunk in _read_columns(path, chunk_rows, columns, numeric_columns):
+                rows += len(chunk)
+                yield chunk
+        seconds = time.perf_counter() - start
+        tables[table] = {
+            'files': paths,
+            'rows': rows,
+            'bytes': sum(os.path.getsize(path) for path in paths),
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(rows / seconds) if seconds else None
+        }
+    
+    # Dimension: valid and unique CPFs, unique identity columns
+    dim_hashes = {column: [] for column in UNIQUE_DIM_COLUMNS}
+    for chunk in stream('dimension', dim_paths, UNIQUE_DIM_COLUMNS, []):
+        results.add('dimension', 'cpf_check_digits', 'CPF', len(chunk), (~valid_cpfs(chunk['CPF'])).sum())
+        for column in chunk.columns:
+            dim_hashes[column].append(_hash_values(chunk[column]))
+    for column, hashes in dim_hashes.items():
+        if hashes:
+            results.add('dimension', 'unique', column, sum(len(part) for part in hashes), _count_duplicates(hashes))
+    dim_keys = np.unique(np.concatenate(dim_hashes['CPF']))
+    
+    # Facts: valid keys present in the dimension, unique IDs, dates and ranges
+    key = generator.FACT_KEY
+    wanted = [key, generator.FACT_ID, *generator.FACT_DATES, *generator.FACT_RANGES]
+    id_hashes = []
+    for chunk in stream('facts', fact_paths, wanted, list(generator.FACT_RANGES)):
+        keys = chunk[key]
+        results.add('facts', 'cpf_check_digits', key, len(chunk), (~valid_cpfs(keys)).sum())
+        hashes = _hash_values(keys)
+        positions = np.minimum(np.searchsorted(dim_keys, hashes), max(len(dim_keys) - 1, 0))
+        orphans = len(hashes) if not len(dim_keys) else (dim_keys[positions] != hashes).sum()
+        results.add('facts', 'foreign_key', key, len(chunk), orphans)
+        id_hashes.append(_hash_values(chunk[generator.FACT_ID]))
+        
+        for column, window in generator.FACT_DATES.items():
+            if column in chunk:
+                _check_dates(results, chunk[column], column, window, reference_time)
+        for column, (low, high) in generator.FACT_RANGES.items():
+            if column in chunk:
+                values = pd.to_numeric(chunk[column], errors='coerce')
+                present = chunk[column].notna()
+                failures = (present & values.isna()).sum() + ((values < low) | (values > high)).sum()
+                results.add('facts', 'range', column, int(present.sum()), failures)
+    results.add('facts', 'unique', generator.FACT_ID, sum(len(part) for part in id_hashes), _count_duplicates(id_hashes))
+    _finish_date_checks(results, generator, reference_time)
+    
+    checks = results.finish()
+    return {
+        'business_case': business_case,
+        'reference_time': reference_time.isoformat() if reference_time else None,
+        'tables': tables,
+        'checks': checks,
+        'passed': all(check['passed'] for check in checks)
+    }
+
+def print_validation_report(report: Dict[str, Any]) -> None:
+    """Print the checks and throughput of a validate_files report"""
+    print(f"{'':<6} {'Table':<10} {'Check':<17} {'Column':<24} {'Rows':>12} {'Failures':>10}")
+    for check in report['checks']:
+        status = 'OK' if check['passed'] else 'FAIL'
+        print(f"{status:<6} {check['table']:<10} {check['check']:<17} {check['column']:<24} "
+              f"{check['rows']:>12} {check['failures']:>10}")
+    for table, stats in report['tables'].items():
+        rate = f"{stats['rows_per_second']:,} rows/s" if stats['rows_per_second'] else '-'
+        print(f"{table}: {stats['rows']:,} rows, {stats['bytes'] / 1e6:.1f} MB in {stats['seconds']:.2f}s ({rate})")
+    print('All checks passed' if report['passed'] else 'Validation FAILED')
+
+###############################
+# Output Cache
+###############################
+
+# Default size bound of the output cache
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Hash of this file's source, computed once; any code change invalidates cached outputs
+_SOURCE_VERSION: Optional[str] = None
+
+def source_version() -> str:
+    """Short hash of the generator source, part of every cache key"""
+    global _SOURCE_VERSION
+    if _SOURCE_VERSION is None:
+        with open(os.path.abspath(__file__), 'rb') as f:
+            _SOURCE_VERSION = hashlib.sha256(f.read()).hexdigest()[:16]
+    return _SOURCE_VERSION
+
+def _link_or_copy(source: str, destination: str) -> None:
+    """Hard-link source to destination, copying when linking is not possible (e.g. across devices)"""
+    _replace_path(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+class OutputCache:
+    """
+    Content-addressed cache of saved output files
+    
+    Entries are keyed by a hash of everything that determines the files
+    (business case, row counts, seed, reference time, format, ...) and the
+    generator source version. Files are hard-linked in and out of the cache,
+    so a hit costs a few metadata operations and no extra disk space; writers
+    remove an existing output before writing, so a linked file is never
+    modified in place. A JSON manifest records each entry's parameters,
+    files, size and last use, and the least recently used entries are
+    evicted once the cache grows past max_bytes. Runs sharing a cache
+    directory update the manifest under an exclusive lock file.
+    
+    Only reproducible outputs belong in the cache, i.e. seeded runs with a
+    pinned reference time.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.objects = os.path.join(directory, 'objects')
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self.lock_path = os.path.join(directory, 'manifest.lock')
+        os.makedirs(self.objects, exist_ok=True)
+    
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        """Cache key of a set of generation parameters"""
+        payload = json.dumps({**params, 'version': source_version()}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the cache lock around a read-modify-write of the manifest"""
+        with open(self.lock_path, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'entries': {}}
+    
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        # Write then rename, so a concurrent reader never sees a partial manifest
+        fd, path = tempfile.mkstemp(prefix='.manifest-', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            os.replace(path, self.manifest_path)
+        except BaseException:
+            os.unlink(path)
+            raise
+    
+    def _drop(self, manifest: Dict[str, Any], key: str) -> None:
+        manifest['entries'].pop(key, None)
+        shutil.rmtree(os.path.join(self.objects, key), ignore_errors=True)
+    
+    def restore(self, key: str, output_dir: str) -> Optional[List[str]]:
+        """
+        Link a cached entry's files into output_dir
+        
+        Returns the restored paths, or None on a miss (including an entry
+        whose files were changed or removed, which is dropped).
+        """
+        # Locked throughout, so a concurrent eviction can't remove the files being linked
+        with self._locked():
+            manifest = self._load_manifest()
+            entry = manifest['entries'].get(key)
+            if entry is None:
+                return None
+            
+            entry_dir = os.path.join(self.objects, key)
+            sources = [os.path.join(entry_dir, name) for name in entry['files']]
+            if not all(os.path.isfile(path) and os.path.getsize(path) == size
+                       for path, size in zip(sources, entry['sizes'])):
+                self._drop(manifest, key)
+                self._save_manifest(manifest)
+                return None
+            
+            os.makedirs(output_dir, exist_ok=True)
+            paths = []
+            for source, name in zip(sources, entry['files']):
+                paths.append(os.path.join(output_dir, name))
+                _link_or_copy(source, paths[-1])
+            
+            entry['last_used'] = time.time()
+            entry['hits'] = entry.get('hits', 0) + 1
+            self._save_manifest(manifest)
+            return paths
+    
+    def store(self, key: str, params: Dict[str, Any], paths: List[str]) -> None:
+        """Add freshly written files under key, then evict down to max_bytes"""
+        entry_dir = os.path.join(self.objects, key)
+        if os.path.isdir(entry_dir):
+            return
+        
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.objects)
+        for path in paths:
+            _link_or_copy(path, os.path.join(staging, os.path.basename(path)))
+        try:
+            os.rename(staging, entry_dir)
+        except OSError:
+            # Stored concurrently by another run
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        
+        with self._locked():
+            manifest = self._load_manifest()
+            now = time.time()
+            manifest['entries'][key] = {
+                'params': params,
+                'version': source_version(),
+                'files': [os.path.basename(path) for path in paths],
+                'sizes': [os.path.getsize(path) for path in paths],
+                'created': now,
+                'last_used': now,
+                'hits': 0
+            }
+            self._evict(manifest, keep=key)
+            self._save_manifest(manifest)
+    
+    def _evict(self, manifest: Dict[str, Any], keep: Optional[str] = None) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = manifest['entries']
+        total = sum(sum(entry['sizes']) for entry in entries.values())
+        for key in sorted(entries, key=lambda key: entries[key]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                total -= sum(entries[key]['sizes'])
+                self._drop(manifest, key)
+
+###############################
+# Data Service
+###############################
+
+# Largest page a client may request and rows formatted per streamed chunk
+SERVICE_MAX_LIMIT = 100000
+SERVICE_CHUNK_ROWS = 5000
+SERVICE_FORMATS = {'csv': 'text/csv; charset=utf-8', 'ndjson': 'application/x-ndjson; charset=utf-8'}
+
+class DataService:
+    """
+    On-demand page generation with an LRU cache of recently served pages
+    
+    The dimension of a (business case, seed, dimension rows) triple is
+    generated once and kept with the pages. Fact pages are assembled from
+    cached row blocks (see generate_rows), so a row has the same content
+    whatever offset and limit it is requested with. Generation runs under a
+    lock because the generators share the global random and Faker state.
+    """
+    
+    def __init__(self, cache_size: int = 128, dim_rows: int = NUM_ROWS_DIM,
+                 reference_time: Optional[datetime] = None):
+        self.cache_size = cache_size
+        self.dim_rows = dim_rows
+        self.reference_time = reference_time or datetime.combine(datetime.now().date(), datetime.min.time())
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.generation_lock = threading.Lock()
+    
+    def _cached(self, key: Tuple, build: Any) -> pd.DataFrame:
+        with self.cache_lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+        
+        with self.generation_lock:
+            df = build()
+        
+        with self.cache_lock:
+            self.cache[key] = df
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return df
+    
+    def dimension(self, business_case: str, seed: int, dim_rows: int) -> pd.DataFrame:
+        """Full dimension table for a business case and seed"""
+        def build() -> pd.DataFrame:
+            set_seed(seed)
+            with pinned_reference_time(self.reference_time):
+                return GENERATORS[business_case].generate_dimension(dim_rows)
+        return self._cached(('dimension', business_case, seed, dim_rows), build)
+    
+    def page(self, business_case: str, table: str, seed: int, dim_rows: int, offset: int, limit: int) -> pd.DataFrame:
+        """One page of the dimension or fact table"""
+        dim_df = self.dimension(business_case, seed, dim_rows)
+        if table == 'dimension':
+            return dim_df.iloc[offset:offset + limit]
+        
+        parts = []
+        dim_arrays = dimension_arrays(business_case, dim_df)
+        for block in range(offset // ROW_BLOCK_SIZE, -(-(offset + limit) // ROW_BLOCK_SIZE)):
+            def build() -> pd.DataFrame:
+                with pinned_reference_time(self.reference_time):
+                    return generate_block(business_case, dim_arrays, block, seed)
+            parts.append(self._cached(('facts', business_case, seed, dim_rows, block), build))
+        return pd.concat(parts).loc[offset:offset + limit - 1]
+
+class _DataServiceHandler(BaseHTTPRequestHandler):
+    """GET /<business_case>/<dimension|facts>?seed=&offset=&limit=&format=&dim_rows="""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        print(f"{self.address_string()} - {format % args}", file=sys.stderr)
+    
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+    
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        
+        if not parts:
+            self._send_json(200, {
+                'business_cases': list(GENERATORS.keys()),
+                'endpoints': ['/<business_case>/dimension', '/<business_case>/facts'],
+                'parameters': ['seed', 'offset', 'limit', 'format', 'dim_rows']
+            })
+            return
+        if len(parts) != 2 or parts[0] not in GENERATORS or parts[1] not in ('dimension', 'facts'):
+            self._send_json(404, {'error': f"Unknown endpoint '{url.path}'"})
+            return
+        
+        service = self.server.service
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            seed = int(query.get('seed', 0))
+            offset = int(query.get('offset', 0))
+            limit = int(query.get('limit', 1000))
+            dim_rows = int(query.get('dim_rows', service.dim_rows))
+        except ValueError as e:
+            self._send_json(400, {'error': f"Invalid parameter: {e}"})
+            return
+        output_format = query.get('format', 'csv')
+        if output_format not in SERVICE_FORMATS:
+            self._send_json(400, {'error': f"Format '{output_format}' not supported. Available options: {', '.join(SERVICE_FORMATS)}"})
+            return
+        max_dim_rows = max(SERVICE_MAX_LIMIT, service.dim_rows)
+        if offset < 0 or not 0 < limit <= SERVICE_MAX_LIMIT or not 0 < dim_rows <= max_dim_rows:
+            self._send_json(400, {'error': f"offset must be >= 0, 0 < limit <= {SERVICE_MAX_LIMIT} "
+                                           f"and 0 < dim_rows <= {max_dim_rows}"})
+            return
+        
+        try:
+            df = service.page(parts[0], parts[1], seed, dim_rows, offset, limit)
+        except Exception as e:
+            self.log_message("page generation failed: %r", e)
+            self._send_json(500, {'error': f"Failed to generate page: {e}"})
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', SERVICE_FORMATS[output_format])
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for start in range(0, max(len(df), 1), SERVICE_CHUNK_ROWS):
+            chunk = df.iloc[start:start + SERVICE_CHUNK_ROWS]
+            if output_format == 'csv':
+                self._write_chunk(_format_csv_chunk(chunk, start == 0, None, 0))
+            elif len(chunk):
+                self._write_chunk(chunk.to_json(orient='records', lines=True, date_format='iso',
+                                                date_unit='us', force_ascii=False).rstrip('\n').encode('utf-8') + b'\n')
+        self.wfile.write(b"0\r\n\r\n")
+
+def make_server(host: str = '127.0.0.1', port: int = 8000, cache_size: int = 128,
+                dim_rows: int = NUM_ROWS_DIM) -> ThreadingHTTPServer:
+    """
+    Create (without starting) the HTTP data service
+    
+    Parameters:
+    -----------
+    host : str
+        Interface to bind
+    port : int
+        Port to bind (0 picks a free port)
+    cache_size : int
+        Number of generated row blocks kept in the LRU cache
+    dim_rows : int
+        Default number of dimension rows per business case
+        
+    Returns:
+    --------
+    ThreadingHTTPServer
+        Server ready for serve_forever(), handling each client in its own thread
+    """
+    server = ThreadingHTTPServer((host, port), _DataServiceHandler)
+    server.daemon_threads = True
+    server.service = DataService(cache_size=cache_size, dim_rows=dim_rows)
+    return server
+
+def _fit_command(argv: List[str]) -> None:
+    """Profile a sample file and save the spec: el_dados.py fit SAMPLE --spec SPEC"""
+    parser = argparse.ArgumentParser(prog='el_dados.py fit', description='Learn column profiles from a sample CSV/Parquet file')
+    parser.add_argument('sample', type=str, help='CSV (optionally .gz/.zst) or Parquet file to profile')
+    parser.add_argument('--spec', type=str, required=True, help='Path of the JSON spec to write')
+    parser.add_argument('--chunk-rows', type=int, default=CSV_CHUNK_ROWS,
+                        help=f'Rows read per chunk (default: {CSV_CHUNK_ROWS})')
+    parser.add_argument('--keep-text-values', action='store_true',
+                        help='Store raw values of high-cardinality text columns in the spec and replay them '
+                             '(default: only their format and shapes)')
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    profile = profile_file(args.sample, chunk_rows=args.chunk_rows, keep_text_values=args.keep_text_values)
+    save_profile(profile, args.spec)
+    print(f"Profiled {profile['rows']} rows, {len(profile['columns'])} columns in "
+          f"{time.perf_counter() - start:.2f}s; spec saved to {args.spec}")
+
+def _sample_command(argv: List[str]) -> None:
+    """Generate rows from a saved spec: el_dados.py sample SPEC --rows N --output PATH"""
+    parser = argparse.ArgumentParser(prog='el_dados.py sample', description='Generate rows from a spec written by fit')
+    parser.add_argument('spec', type=str, help='JSON spec written by the fit command')
+    parser.add_argument('--rows', type=int, default=NUM_ROWS_FACT, help=f'Number of rows (default: {NUM_ROWS_FACT})')
+    parser.add_argument('--output', type=str, required=True, help="CSV file to write, or '-' for standard output")
+    parser.add_argument('--seed', type=parse_seed, default=None, help='Seed for reproducible output (default: random)')
+    parser.add_argument('--compression', choices=['gzip', 'zstd'], default=None,
+                        help='Compress the CSV output (default: none)')
+    args = parser.parse_args(argv)
+    try:
+        check_output_packages(compression=args.compression)
+    except ImportError as e:
+        parser.error(f"{e}; optional packages are listed in requirements-optional.txt")
+    
+    df = generate_from_profile(load_profile(args.spec), args.rows, seed=args.seed)
+    write_csv(df, args.output, compression=args.compression)
+    if args.output != '-':
+        print(f"{len(df)} rows saved to {args.output}")
+
+def _validate_command(argv: List[str]) -> None:
+    """Check a saved dataset: el_dados.py validate CASE [--output-dir DIR]"""
+    parser = argparse.ArgumentParser(prog='el_dados.py validate', description='Check the invariants of generated files')
+    parser.add_argument('business_case', type=str, help='Business case whose files to check')
+    parser.add_argument('--output-dir', type=str, default='data', help='Directory holding the files (default: data)')
+    parser.add_argument('--reference-date', type=str, default=None,
+                        help="'Now' the data was generated against, YYYY-MM-DD[THH:MM:SS], for exact date window checks")
+    parser.add_argument('--chunk-rows', type=int, default=VALIDATE_CHUNK_ROWS,
+                        help=f'Rows read per chunk (default: {VALIDATE_CHUNK_ROWS})')
+    parser.add_argument('--report', type=str, default=None, help='Also save the report as JSON to this path')
+    args = parser.parse_args(argv)
+    
+    reference_time = datetime.fromisoformat(args.reference_date) if args.reference_date else None
+    report = validate_files(args.business_case, args.output_dir, args.chunk_rows, reference_time)
+    print_validation_report(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if not report['passed']:
+        sys.exit(1)
+
+def _merge_command(argv: List[str]) -> None:
+    """Combine shard manifests: el_dados.py merge CASE [--output-dir DIR]"""
+    parser = argparse.ArgumentParser(prog='el_dados.py merge', description='Check and combine the manifests of sharded runs')
+    parser.add_argument('business_case', type=str, help='Business case generated with --shard')
+    parser.add_argument('--output-dir', type=str, default='data', help='Directory holding the shard files (default: data)')
+    args = parser.parse_args(argv)
+    
+    merged = merge_shards(args.output_dir, args.business_case)
+    print(f"{merged['num_shards']} shards, {merged['fact_rows']} fact rows; manifest saved to "
+          f"{os.path.join(args.output_dir, merged['business_case'] + '_facts.manifest.json')}")
+
+def _serve_command(argv: List[str]) -> None:
+    """Run the HTTP data service: el_dados.py serve [--host HOST] [--port PORT]"""
+    parser = argparse.ArgumentParser(prog='el_dados.py serve', description='Serve generated data over HTTP, page by page')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to bind (default: 8000)')
+    parser.add_argument('--cache-size', type=int, default=128,
+                        help=f'Generated blocks of {ROW_BLOCK_SIZE} rows kept in memory (default: 128)')
+    parser.add_argument('--dim-rows', type=int, default=NUM_ROWS_DIM,
+                        help=f'Default number of dimension rows (default: {NUM_ROWS_DIM})')
+    args = parser.parse_args(argv)
+    
+    server = make_server(args.host, args.port, args.cache_size, args.dim_rows)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/ (e.g. /banking/facts?seed=1&offset=0&limit=1000)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def _generate_single(business_case: str, args: argparse.Namespace) -> Tuple[Table, Table, str]:
+    """Generate one business case from the CLI options, returning (dim, facts, fact file suffix)"""
+    reference_time = datetime.fromisoformat(args.reference_date) if args.reference_date else None
+    if args.rows is None and args.shard is None:
+        dim_df, fact_df = generate_data(business_case, args.dim_rows, args.fact_rows, seed=args.seed,
+                                        fact_workers=args.fact_workers, reference_time=reference_time,
+                                        backend=args.backend, dim_from=args.dim_from)
+        return dim_df, fact_df, ''
+    
+    if args.seed is None:
+        raise ValueError("--rows and --shard require --seed")
+    if args.shard is not None:
+        start, stop = shard_range(args.fact_rows, args.shard, args.num_shards)
+        suffix = shard_suffix(args.shard, args.num_shards)
+    else:
+        start, stop = parse_row_range(args.rows)
+        suffix = f".rows-{start}-{stop}"
+    
+    # Same dimension as generate_data with this seed, then only the requested fact rows
+    dim_df, fact_df = generate_range(business_case, args.dim_rows, start, stop, args.seed, reference_time,
+                                     args.backend, args.fact_workers, args.dim_from)
+    return dim_df, fact_df, suffix
+
+def _cache_params(business_case: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Everything in the CLI options that determines the saved files of one business case"""
+    with pinned_reference_time(datetime.fromisoformat(args.reference_date) if args.reference_date else None) as now:
+        reference = now.isoformat()
+    return {
+        'business_case': business_case,
+        'dim_rows': args.dim_rows if not args.dim_from else None,
+        'dim_from': args.dim_from,
+        'fact_rows': args.fact_rows if args.rows is None else None,
+        'rows': args.rows,
+        'shard': args.shard,
+        'num_shards': args.num_shards,
+        'seed': args.seed,
+        'reference_time': reference,
+        'anomalies': args.anomalies,
+        'dim_anomalies': args.dim_anomalies,
+        'compression': args.compression,
+        'file_format': args.file_format,
+        'backend': args.backend
+    }
+
+def _inject_cli_anomalies(business_case: str, dim_df: Table, fact_df: Table,
+                          args: argparse.Namespace) -> Tuple[Table, Table]:
+    """Apply --anomalies / --dim-anomalies and save their manifests next to the output files"""
+    tables = [('facts', args.anomalies), ('dimension', args.dim_anomalies)]
+    if not any(spec for _, spec in tables):
+        return dim_df, fact_df
+    
+    # Anomalies are injected on pandas frames whatever the backend
+    os.makedirs(args.output_dir, exist_ok=True)
+    dim_df, fact_df = to_pandas(dim_df), to_pandas(fact_df)
+    dim_keys = dim_df['CPF'].to_numpy()
+    for table, spec in tables:
+        if not spec:
+            continue
+        if table == 'facts':
+            generator = GENERATORS[business_case]
+            fact_df, manifest = inject_anomalies(fact_df, parse_anomaly_rates(spec), generator.FACT_KEY,
+                                                 dim_keys=dim_keys, seed=args.seed,
+                                                 date_column=next(iter(generator.FACT_DATES)))
+        else:
+            dim_df, manifest = inject_anomalies(dim_df, parse_anomaly_rates(spec), 'CPF', seed=args.seed)
+        manifest.update(business_case=business_case, table=table)
+        path = os.path.join(args.output_dir, f"{business_case}_{table}.anomalies.json")
+        save_manifest(manifest, path)
+        print(f"Anomaly manifest saved to {path}")
+    return dim_df, fact_df
+
+# Subcommands; anything else on the command line is a business case to generate
+COMMANDS = {
+    'fit': _fit_command,
+    'sample': _sample_command,
+    'validate': _validate_command,
+    'merge': _merge_command,
+    'serve': _serve_command
+}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        try:
+            COMMANDS[argv[0]](argv[1:])
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
+    # Set up command line arguments
+    parser = argparse.ArgumentParser(description='Generate synthetic business data for analytics')
+    parser.add_argument('business_case', type=str,
+                        help="Business case to generate data for ('all' or a comma-separated list for several)")
+    parser.add_argument('--dim-rows', type=int, default=NUM_ROWS_DIM, 
+                        help=f'Number of dimension rows (default: {NUM_ROWS_DIM})')
+    parser.add_argument('--fact-rows', type=int, default=NUM_ROWS_FACT, 
+                        help=f'Number of fact rows (default: {NUM_ROWS_FACT})')
+    parser.add_argument('--output-dir', type=str, default='data', 
+                        help='Directory to save output files (default: data)')
+    parser.add_argument('--seed', type=parse_seed, default=None,
+                        help='Seed for reproducible output (default: random)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes when generating several business cases (default: one per case, up to the CPU count)')
+    parser.add_argument('--fact-workers', type=int, default=None,
+                        help='Worker processes for the fact table of a single business case (default: in-process)')
+    parser.add_argument('--rows', type=str, default=None, metavar='START:STOP',
+                        help='Generate only fact rows START:STOP of the seeded fact table (requires --seed)')
+    parser.add_argument('--reference-date', type=str, default=None,
+                        help="'Now' for seeded fact dates, YYYY-MM-DD[THH:MM:SS] (default: today at midnight)")
+    parser.add_argument('--dim-from', type=str, default=None, metavar='PATH',
+                        help='Generate only facts, against this existing dimension file (CSV, Parquet or Arrow IPC); '
+                             'only the columns the facts need are loaded')
+    parser.add_argument('--shard', type=int, default=None,
+                        help='Generate only this shard (0-based) of the seeded fact table (requires --seed and --num-shards)')
+    parser.add_argument('--num-shards', type=int, default=None,
+                        help='Number of shards the fact table is split into')
+    parser.add_argument('--anomalies', type=str, default=None, metavar='NAME=RATE,...',
+                        help=f"Inject dirty data into the fact table, e.g. duplicates=0.01,orphan_keys=0.005 "
+                             f"(available: {', '.join(ANOMALIES)})")
+    parser.add_argument('--dim-anomalies', type=str, default=None, metavar='NAME=RATE,...',
+                        help='Inject dirty data into the dimension table (same format as --anomalies)')
+    parser.add_argument('--compression', choices=['gzip', 'zstd'], default=None,
+                        help='Compress the output files (default: none; snappy for Parquet)')
+    parser.add_argument('--backend', choices=BACKENDS, default='pandas',
+                        help='Table library used to build the data (default: pandas)')
+    parser.add_argument('--format', dest='file_format', choices=list(FILE_FORMATS), default='csv',
+                        help='Output file format: csv, parquet or ipc (Arrow IPC file) (default: csv)')
+    parser.add_argument('--csv-executor', choices=['process', 'thread'], default='process',
+                        help='Format CSV chunks in worker processes or threads (default: process; '
+                             'threads only overlap the gzip compression)')
+    parser.add_argument('--stdout', action='store_true',
+                        help='Stream the fact table CSV to standard output (the dimension is still saved to --output-dir)')
+    parser.add_argument('--cache-dir', type=str, default=os.environ.get('MEGAZORD_CACHE_DIR'),
+                        help='Reuse identical seeded outputs from this cache directory (default: $MEGAZORD_CACHE_DIR, '
+                             'no cache when unset)')
+    parser.add_argument('--cache-max-mb', type=int, default=CACHE_MAX_BYTES // 1024 ** 2,
+                        help=f'Size bound of the cache, least recently used entries are evicted first '
+                             f'(default: {CACHE_MAX_BYTES // 1024 ** 2})')
+    
+    args = parser.parse_args(argv)
+    try:
+        check_output_packages(args.backend, args.file_format, args.compression)
+    except ImportError as e:
+        parser.error(f"{e}; optional packages are listed in requirements-optional.txt")
+    
+    # Generate and save data
+    try:
+        business_cases = parse_business_cases(args.business_case)
+        for spec in (args.anomalies, args.dim_anomalies):
+            if spec:
+                parse_anomaly_rates(spec)
+        if args.dim_anomalies and 'late_arriving' in parse_anomaly_rates(args.dim_anomalies):
+            raise ValueError("late_arriving applies to fact tables only, not to --dim-anomalies")
+        if (args.shard is None) != (args.num_shards is None):
+            raise ValueError("--shard and --num-shards must be given together")
+        if args.shard is not None and (args.rows is not None or args.stdout or args.anomalies or args.dim_anomalies):
+            raise ValueError("--shard does not support --rows, --stdout or --anomalies")
+        if args.dim_from and (len(business_cases) != 1 or args.dim_anomalies):
+            raise ValueError("--dim-from supports a single business case and no --dim-anomalies")
+        if args.file_format == 'ipc' and args.compression == 'gzip':
+            raise ValueError("IPC files support zstd compression only")
+        if args.stdout:
+            if len(business_cases) != 1:
+                raise ValueError("--stdout supports a single business case")
+            if args.file_format != 'csv':
+                raise ValueError("--stdout supports CSV output only")
+            
+            # Keep standard output clean for the CSV stream
+            with contextlib.redirect_stdout(sys.stderr):
+                dim_df, fact_df, _ = _generate_single(business_cases[0], args)
+                dim_df, fact_df = _inject_cli_anomalies(business_cases[0], dim_df, fact_df, args)
+                if not args.dim_from:
+                    os.makedirs(args.output_dir, exist_ok=True)
+                    dim_path = os.path.join(args.output_dir, f"{business_cases[0]}_dimension.csv{CSV_COMPRESSIONS[args.compression]}")
+                    write_csv(dim_df, dim_path, compression=args.compression, use_processes=args.csv_executor == 'process')
+                    print(f"Dimension table saved to {dim_path}")
+            write_csv(fact_df, '-', compression=args.compression, use_processes=args.csv_executor == 'process')
+        elif len(business_cases) == 1:
+            # Seeded runs are reproducible, so their files can come from the cache
+            # (not with --dim-from: the output then depends on the file's contents)
+            cache = params = key = None
+            if args.cache_dir and args.seed is not None and not args.dim_from:
+                cache = OutputCache(args.cache_dir, args.cache_max_mb * 1024 ** 2)
+                params = _cache_params(business_cases[0], args)
+                key = cache.key(params)
+            
+            restored = cache.restore(key, args.output_dir) if cache else None
+            if restored:
+                for path in restored:
+                    print(f"Restored {path} from cache")
+            else:
+                dim_df, fact_df, fact_suffix = _generate_single(business_cases[0], args)
+                dim_df, fact_df = _inject_cli_anomalies(business_cases[0], dim_df, fact_df, args)
+                
+                # Every shard has the dimension, the first one saves it; a loaded one is not saved again
+                if args.shard or args.dim_from:
+                    dim_df = None
+                paths = save_data(dim_df, fact_df, business_cases[0], args.output_dir, compression=args.compression,
+                                  fact_suffix=fact_suffix, file_format=args.file_format,
+                                  use_processes=args.csv_executor == 'process')
+                if args.shard is not None:
+                    params = params or _cache_params(business_cases[0], args)
+                    shard_params = {name: value for name, value in params.items() if name != 'shard'}
+                    paths.append(save_shard_manifest(args.output_dir, business_cases[0], args.shard, args.num_shards,
+                                                     shard_params, shard_range(args.fact_rows, args.shard, args.num_shards),
+                                                     paths))
+                if cache:
+                    paths += [os.path.join(args.output_dir, f"{business_cases[0]}_{table}.anomalies.json")
+                              for table, spec in (('facts', args.anomalies), ('dimension', args.dim_anomalies)) if spec]
+                    cache.store(key, params, paths)
+        else:
+            if args.rows is not None or args.shard is not None or args.anomalies or args.dim_anomalies:
+                raise ValueError("--rows, --shard and --anomalies support a single business case")
+            reference_time = datetime.fromisoformat(args.reference_date) if args.reference_date else None
+            start = time.perf_counter()
+            results = generate_batch(business_cases, args.dim_rows, args.fact_rows, args.output_dir,
+                                     seed=args.seed, max_workers=args.workers, compression=args.compression,
+                                     backend=args.backend, file_format=args.file_format,
+                                     reference_time=reference_time, fact_workers=args.fact_workers,
+                                     use_processes=args.csv_executor == 'process')
+            print_batch_summary(results, time.perf_counter() - start)
+        print(f"Successfully generated data for {args.business_case} business case!",
+              file=sys.stderr if args.stdout else sys.stdout)
+    except Exception as e:
+        print(f"Error generating data: {e}", file=sys.stderr if args.stdout else sys.stdout)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import json
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import el_dados
+
+
+def test_profile_keeps_decimals_of_large_amounts(tmp_path):
+    path = tmp_path / 'amounts.csv'
+    values = np.round(np.linspace(123456.78, 4325894.57, 200), 2)
+    values[0] = 123456.78
+    pd.DataFrame({'Valor': values, 'Inteiro': np.arange(200) * 100000}).to_csv(path, index=False)
+    
+    columns = {column['name']: column for column in el_dados.profile_file(str(path))['columns']}
+    assert columns['Valor']['decimals'] == 2
+    assert columns['Inteiro']['decimals'] == 0
+
+
+def test_served_dimension_matches_pinned_cli_dimension():
+    reference_time = el_dados.datetime(2020, 1, 1)
+    service = el_dados.DataService(reference_time=reference_time)
+    served = service.dimension('banking', 7, 50)
+    
+    dim_df, _ = el_dados.generate_data('banking', 50, 10, seed=7, reference_time=reference_time)
+    pd.testing.assert_frame_equal(served, dim_df)
+    assert served['Data_Abertura_Conta'].astype(str).max() < '2020-01-02'
+
+
+def test_worker_keeps_only_the_current_shared_dimension():
+    dim_df, _ = el_dados.generate_data('banking', 30, 10, seed=1)
+    for _ in range(2):
+        with el_dados.SharedDimension(dim_df, el_dados.BankingDataGenerator.DIM_COLUMNS) as shared:
+            facts = el_dados._parallel_facts_worker('banking', shared.spec, 0, 10, 1, None, 'pandas')
+            assert len(facts) == 10
+            assert list(el_dados._attached_dimensions) == [shared.spec['directory']]
+
+
+def test_late_arriving_moves_only_the_named_event_date():
+    dim_df, fact_df = el_dados.generate_data('banking', 30, 200, seed=2)
+    dirty, manifest = el_dados.inject_anomalies(fact_df, {'late_arriving': 0.1}, 'CPF', seed=2,
+                                                date_column='Data_Transacao')
+    rows = manifest['anomalies']['late_arriving']['rows']
+    assert manifest['anomalies']['late_arriving']['column'] == 'Data_Transacao'
+    assert (dirty.loc[rows, 'Data_Transacao'] < fact_df.loc[rows, 'Data_Transacao']).all()
+    
+    with pytest.raises(ValueError):
+        el_dados.inject_anomalies(dim_df, {'late_arriving': 0.1}, 'CPF', seed=2)
+
+
+def _store_entries(directory, source_dir, worker, count):
+    cache = el_dados.OutputCache(directory)
+    for index in range(count):
+        path = os.path.join(source_dir, f'{worker}-{index}.csv')
+        with open(path, 'w') as f:
+            f.write('a\n1\n')
+        cache.store(cache.key({'worker': worker, 'index': index}), {'worker': worker}, [path])
+
+
+def test_concurrent_cache_stores_keep_every_entry(tmp_path):
+    cache_dir, source_dir = tmp_path / 'cache', tmp_path / 'source'
+    source_dir.mkdir()
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_store_entries, args=(str(cache_dir), str(source_dir), worker, 20))
+                 for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    
+    with open(cache_dir / 'manifest.json', encoding='utf-8') as f:
+        assert len(json.load(f)['entries']) == 80
+
+
+def test_merged_shards_equal_unsharded_run(tmp_path):
+    num_rows, num_shards = 2 * el_dados.ROW_BLOCK_SIZE + 1234, 3
+    reference_time = el_dados.datetime(2025, 1, 1)
+    dim_df, fact_df = el_dados.generate_data('realestate', 40, num_rows, seed=9, reference_time=reference_time)
+    
+    shards, stop = [], 0
+    for shard in range(num_shards):
+        shard_dim, shard_facts, (start, end) = el_dados.generate_shard(
+            'realestate', shard, num_shards, 40, num_rows, seed=9, reference_time=reference_time)
+        assert start == stop and start % el_dados.ROW_BLOCK_SIZE == 0
+        pd.testing.assert_frame_equal(shard_dim, dim_df)
+        paths = el_dados.save_data(shard_dim if shard == 0 else None, shard_facts, 'realestate', str(tmp_path),
+                                   fact_suffix=el_dados.shard_suffix(shard, num_shards))
+        el_dados.save_shard_manifest(str(tmp_path), 'realestate', shard, num_shards,
+                                     {'fact_rows': num_rows, 'seed': 9}, (start, end), paths)
+        shards.append(shard_facts)
+        stop = end
+    
+    assert el_dados.merge_shards(str(tmp_path), 'realestate')['fact_rows'] == num_rows
+    pd.testing.assert_frame_equal(pd.concat(shards, ignore_index=True), fact_df)
+
+
+def test_unaligned_first_row_matches_generate_rows():
+    dim_df, _ = el_dados.generate_data('realestate', 40, 10, seed=4)
+    start, stop = el_dados.ROW_BLOCK_SIZE - 321, 2 * el_dados.ROW_BLOCK_SIZE + 55
+    expected = el_dados.generate_rows('realestate', dim_df, start, stop, 4).reset_index(drop=True)
+    parallel = el_dados.generate_facts_parallel('realestate', dim_df, stop - start, workers=2, seed=4,
+                                                chunk_rows=7000, first_row=start)
+    pd.testing.assert_frame_equal(parallel, expected)
+
+
+def test_missing_optional_packages_fail_at_argument_parsing(monkeypatch, capsys):
+    monkeypatch.setattr(el_dados, 'pa', None)
+    with pytest.raises(SystemExit) as exit_info:
+        el_dados.main(['banking', '--format', 'parquet'])
+    assert exit_info.value.code == 2
+    assert 'requirements-optional.txt' in capsys.readouterr().err
+
+
+def test_generate_cpf_matches_vectorized_format():
+    cpf = el_dados.generate_cpf()
+    assert isinstance(cpf, str)
+    assert el_dados.valid_cpfs(pd.Series([cpf])).all()
+
+
+@pytest.mark.parametrize('business_case', list(el_dados.GENERATORS))
+def test_zero_rows_generate_empty_tables(business_case):
+    generator = el_dados.GENERATORS[business_case]
+    assert len(generator.generate_dimension(0)) == 0
+    dim_df = generator.generate_dimension(5)
+    assert len(generator.generate_facts(dim_df, 0)) == 0
+    assert len(el_dados.generate_rows(business_case, dim_df, 7, 7, seed=1)) == 0
+
+
+def test_more_shards_than_blocks_leaves_trailing_shards_empty(tmp_path):
+    num_rows, num_shards = 2 * el_dados.ROW_BLOCK_SIZE + 5, 5
+    reference_time = el_dados.datetime(2025, 1, 1)
+    _, fact_df = el_dados.generate_data('banking', 20, num_rows, seed=1, reference_time=reference_time)
+    
+    shards = []
+    for shard in range(num_shards):
+        shard_dim, shard_facts, rows = el_dados.generate_shard(
+            'banking', shard, num_shards, 20, num_rows, seed=1, reference_time=reference_time)
+        assert (rows[1] > rows[0]) == (shard < 3)
+        assert list(shard_facts.columns) == list(fact_df.columns)
+        paths = el_dados.save_data(shard_dim if shard == 0 else None, shard_facts, 'banking', str(tmp_path),
+                                   fact_suffix=el_dados.shard_suffix(shard, num_shards))
+        el_dados.save_shard_manifest(str(tmp_path), 'banking', shard, num_shards,
+                                     {'fact_rows': num_rows, 'seed': 1}, rows, paths)
+        shards.append(shard_facts)
+    
+    assert el_dados.merge_shards(str(tmp_path), 'banking')['dimension'] is not None
+    pd.testing.assert_frame_equal(pd.concat(shards, ignore_index=True), fact_df)
+
+
+def test_seeded_batch_matches_generate_data():
+    reference_time = el_dados.datetime(2021, 6, 1)
+    result, = el_dados.generate_batch(['banking'], 20, 300, seed=3, max_workers=1, reference_time=reference_time)
+    dim_df, fact_df = el_dados.generate_data('banking', 20, 300, seed=3 + list(el_dados.GENERATORS).index('banking'),
+                                             reference_time=reference_time)
+    pd.testing.assert_frame_equal(result['dim_df'], dim_df)
+    pd.testing.assert_frame_equal(result['fact_df'], fact_df)
+
+
+def test_negative_seed_is_rejected_by_the_parser():
+    with pytest.raises(SystemExit):
+        el_dados.main(['banking', '--seed', '-1'])
+
+
+def test_generate_unique_switches_to_fallback_once_values_run_out():
+    calls = []
+    
+    def small_space(n):
+        calls.append(n)
+        return np.arange(n) % 1000
+    
+    values = el_dados.generate_unique(small_space, 5000, fallback=lambda n: np.random.default_rng().random(n))
+    assert len(set(values)) == 5000
+    assert len(calls) == 1
+
+
+def test_dimension_arrays_convert_once_and_match_the_table(monkeypatch):
+    dim_df, _ = el_dados.generate_data('callcenter', 30, 10, seed=6)
+    expected = el_dados.generate_rows('callcenter', dim_df, 0, 450, seed=6, block_size=100)
+    
+    conversions = []
+    monkeypatch.setattr(el_dados, 'to_pandas', lambda table: conversions.append(1) or table.to_pandas())
+    arrow_dim = el_dados.to_arrow(dim_df)
+    facts = el_dados.generate_rows('callcenter', arrow_dim, 0, 450, seed=6, block_size=100)
+    assert len(conversions) == 1
+    pd.testing.assert_frame_equal(facts, expected)
+
+
+def test_profile_does_not_store_or_replay_source_text(tmp_path):
+    _, fact_df = el_dados.generate_data('ecommerce', 50, 3000, seed=8)
+    path = tmp_path / 'pedidos.csv'
+    fact_df.to_csv(path, index=False)
+    
+    profile = el_dados.profile_file(str(path))
+    columns = {column['name']: column for column in profile['columns']}
+    assert columns['Pedido_ID']['format'] == 'uuid' and columns['CPF']['format'] == 'cpf'
+    spec = json.dumps(profile, ensure_ascii=False)
+    assert not any(value in spec for value in fact_df['Pedido_ID'].head(100))
+    assert not any(value in spec for value in fact_df['CPF'].unique())
+    
+    sample = el_dados.generate_from_profile(profile, 5000, seed=1)
+    assert sample['Pedido_ID'].nunique() == 5000
+    assert not set(sample['Produto_Principal']) & set(fact_df['Produto_Principal'])
+    assert el_dados.valid_cpfs(sample['CPF']).all()
+
+
+def test_csv_executors_write_identical_bytes(tmp_path):
+    _, facts = el_dados.generate_data('banking', 10, 3000, seed=4)
+    outputs = []
+    for options in ({'workers': 1}, {'workers': 2}, {'workers': 2, 'use_processes': False}):
+        path = tmp_path / f'facts_{len(outputs)}.csv.gz'
+        el_dados.write_csv(facts, str(path), compression='gzip', chunk_rows=1000, **options)
+        outputs.append(pd.read_csv(path).to_csv(index=False))
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert len(pd.read_csv(tmp_path / 'facts_0.csv.gz')) == 3000
+
+
+def test_service_caps_dim_rows_reports_failures_and_keeps_microseconds(monkeypatch):
+    import threading
+    import urllib.error
+    import urllib.request
+    
+    server = el_dados.make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/banking"
+    
+    def get(path):
+        try:
+            with urllib.request.urlopen(base + path) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+    
+    try:
+        status, body = get(f"/dimension?dim_rows={el_dados.SERVICE_MAX_LIMIT + 1}")
+        assert status == 400 and b'dim_rows' in body
+        
+        status, body = get("/facts?seed=3&limit=50&format=ndjson")
+        assert status == 200
+        rows = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+        csv_page = server.service.page('banking', 'facts', 3, server.service.dim_rows, 0, 50)
+        served = pd.to_datetime(pd.Series([row['Data_Transacao'] for row in rows])).dt.tz_localize(None)
+        assert served.tolist() == pd.to_datetime(csv_page['Data_Transacao']).tolist()
+        
+        def fail(*args):
+            raise RuntimeError('boom')
+        monkeypatch.setattr(server.service, 'page', fail)
+        status, body = get("/facts?limit=10")
+        assert status == 500 and json.loads(body)['error'].endswith('boom')
+    finally:
+        server.shutdown()
+        server.server_close()